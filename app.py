@@ -5,24 +5,33 @@ Flask application for the Olympics fantasy pool game.
 """
 
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from functools import wraps
 
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
+import click
+from flask import (
+    Flask, Response, abort, g, render_template, redirect, url_for, flash, request, jsonify,
+    make_response, stream_template, stream_with_context
+)
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_wtf.csrf import CSRFProtect, generate_csrf
-from sqlalchemy import func
+from sqlalchemy import func, select
 from email_validator import validate_email, EmailNotValidError
 
 from config import (
-    config, TIERS, MEDAL_POINTS, TIMEZONE, PICK_DEADLINE, TOTAL_PICKS,
+    config, TIERS, MEDAL_POINTS, TIMEZONE, PICK_DEADLINE,
     TIER_6_WARNING, get_medal_points
 )
 from models import (
-    db, User, Country, Pick, Tiebreaker, GameState,
+    db, User, Country, Pick, GameState,
     is_picks_locked, get_current_time, validate_picks,
-    calculate_all_scores, get_leaderboard, install_pick_constraints,
-    MedalAudit
+    calculate_all_scores, rescore_country, get_leaderboard,
+    compare_scoring_engines, refresh_leaderboard_snapshot, SCORING_ENGINES, MedalAudit,
+    get_game_state, user_status_select, prime_roster_status,
+    publish_score_event, ScoreEvent, country_points_expression, save_user_picks,
+    install_sqlite_pragmas, iter_rosters, medal_table, rank_history, biggest_movers,
+    latest_score_version, refresh_scores_at_lock, country_owners_select
 )
 
 # =============================================================================
@@ -32,12 +41,31 @@ from models import (
 app = Flask(__name__)
 app.config.from_object(config[os.environ.get('FLASK_ENV', 'default')])
 from helpers import register_template_helpers
+from medal_updates import parse_medal_table, apply_medal_table
+from fragment_cache import FragmentCache, highlight_row
+from catalog import get_country_catalog
+from profiling import RequestProfiler
+from exports import EXPORTS, EXPORT_FORMATS, iter_export
+from migrations import upgrade_database, migration_status
+from score_matrix import NumpyUnavailable
+from simulation import (
+    SimulationUnavailable, latest_simulation, refresh_simulation, save_simulation, simulate,
+    simulation_rows, SimulationRun,
+)
 register_template_helpers(app)
 
 # Initialize extensions
 db.init_app(app)
 with app.app_context():
-    install_pick_constraints()
+    install_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+    upgrade_database()
+    # Don't hand connections opened at import to forked gunicorn workers
+    db.engine.dispose()
+
+request_profiler = RequestProfiler(app.config['PROFILING_SLOWEST_REQUESTS'])
+if app.config['PROFILING_ENABLED']:
+    with app.app_context():
+        request_profiler.init_app(app, db.engine)
 csrf = CSRFProtect(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -67,24 +95,120 @@ def admin_required(f):
     return decorated_function
 
 
+def conditional_on_game_state(tag, validator=None):
+    """
+    Decorator for GET endpoints whose payload only changes with the game state.
+
+    Responses carry a strong ETag built from the game-state version and a
+    Last-Modified header; matching If-None-Match / If-Modified-Since requests
+    get a 304 before the view (and its queries) runs.
+
+    Payloads that can also change without a game-state bump pass a
+    validator returning (key, modified_at); the key joins the ETag and
+    modified_at counts towards Last-Modified.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            state = current_game_state()
+            etag = f'{tag}-v{state.version}'
+            timestamps = [state.medals_updated_at, state.scores_calculated_at]
+            if validator is not None:
+                key, modified_at = validator()
+                etag = f'{etag}-{key}'
+                timestamps.append(modified_at)
+            last_modified = max((ts for ts in timestamps if ts), default=None)
+            if last_modified is not None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since)
+
+            if not_modified:
+                response = app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return decorated_function
+    return decorator
+
+
 # =============================================================================
 # CONTEXT PROCESSORS
 # =============================================================================
 
+def current_game_state():
+    """Cached game state, looked up at most once per request."""
+    if 'game_state' not in g:
+        g.game_state = get_game_state(app.config['GAME_STATE_CACHE_TTL'])
+    return g.game_state
+
+
+fragment_cache = FragmentCache(app.config['FRAGMENT_CACHE_MAX_BYTES'])
+
+
+def cached_leaderboard_rows(template_name, limit=None):
+    """
+    Rendered leaderboard rows, cached per score version, with the viewer's
+    own row highlighted on top of the shared fragment.
+    """
+    key = (template_name, limit, current_game_state().version)
+    html = fragment_cache.get_or_render(key, lambda: app.jinja_env.get_template(template_name).render(
+        leaderboard=get_leaderboard(limit=limit),
+    ).strip())
+    viewer_id = current_user.id if current_user.is_authenticated else None
+    return highlight_row(html, viewer_id, 'table-warning')
+
+
+def buffered_stream(chunks, min_size=16 * 1024):
+    """Join small template chunks so a streamed page goes out in ~16 KB writes."""
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def current_catalog():
+    """Country catalog matching this request's game state (no query on a hit)."""
+    return get_country_catalog(current_game_state().catalog_version)
+
+
+# Template globals that never change for the life of the process
+STATIC_TEMPLATE_GLOBALS = {
+    'app_name': app.config['APP_NAME'],
+    'app_short_name': app.config['APP_SHORT_NAME'],
+    'pick_deadline': PICK_DEADLINE,
+    'tiers': TIERS,
+    'medal_points': MEDAL_POINTS,
+    'csrf_token': generate_csrf,
+}
+
+
 @app.context_processor
 def inject_globals():
     """Inject global variables into all templates."""
-    game_state = GameState.get_instance()
     return {
-        'app_name': app.config['APP_NAME'],
-        'app_short_name': app.config['APP_SHORT_NAME'],
+        **STATIC_TEMPLATE_GLOBALS,
         'current_time': get_current_time(),
-        'pick_deadline': PICK_DEADLINE,
         'picks_locked': is_picks_locked(),
-        'tiers': TIERS,
-        'medal_points': MEDAL_POINTS,
-        'game_state': game_state,
-        'csrf_token': generate_csrf,
+        'game_state': current_game_state(),
     }
 
 
@@ -95,30 +219,22 @@ def inject_globals():
 @app.route('/')
 def index():
     """Home page - shows leaderboard and game status."""
-    game_state = GameState.get_instance()
-    
     # Get registered user count
     total_users = User.query.count()
     ready_users = User.query.filter(User.picks.any()).count()
     
-    # Get leaderboard if picks are locked
-    leaderboard = []
+    # Get leaderboard preview if picks are locked
+    leaderboard_rows = ''
     if is_picks_locked():
-        leaderboard = get_leaderboard()
+        leaderboard_rows = cached_leaderboard_rows('partials/leaderboard_top10_rows.html', limit=10)
     
     # Get medal leaders (top 5 countries by total medals)
-    medal_leaders = Country.query.filter(
-        (Country.gold_count + Country.silver_count + Country.bronze_count) > 0
-    ).order_by(
-        Country.gold_count.desc(),
-        Country.silver_count.desc(),
-        Country.bronze_count.desc()
-    ).limit(5).all()
+    medal_leaders = medal_table(limit=5, active_only=False)
     
     return render_template('index.html',
                          total_users=total_users,
                          ready_users=ready_users,
-                         leaderboard=leaderboard,
+                         leaderboard_rows=leaderboard_rows,
                          medal_leaders=medal_leaders)
 
 
@@ -129,8 +245,8 @@ def leaderboard():
         flash('Leaderboard will be available after picks lock on February 6th.', 'info')
         return redirect(url_for('index'))
     
-    leaderboard_data = get_leaderboard()
-    game_state = GameState.get_instance()
+    leaderboard_rows = cached_leaderboard_rows('partials/leaderboard_rows.html')
+    game_state = current_game_state()
     
     # Get USA actual medals for tiebreaker display
     usa = Country.query.filter_by(code='USA').first()
@@ -141,7 +257,7 @@ def leaderboard():
     }
     
     return render_template('leaderboard.html',
-                         leaderboard=leaderboard_data,
+                         leaderboard_rows=leaderboard_rows,
                          usa_medals=usa_medals,
                          last_updated=game_state.medals_updated_at)
 
@@ -149,15 +265,25 @@ def leaderboard():
 @app.route('/countries')
 def countries():
     """Browse all countries by tier."""
-    countries_by_tier = {}
-    for tier in range(1, 7):
-        countries_by_tier[tier] = Country.query.filter_by(
-            tier=tier,
-            is_active=True
-        ).order_by(Country.name).all()
+    countries_by_tier = current_catalog().active_by_tier()
+    
+    # Medal counts are live data, fetched in one query once the Games are on
+    medals = {}
+    if is_picks_locked():
+        medals = {
+            row.id: row
+            for row in db.session.execute(select(
+                Country.id,
+                Country.gold_count.label('gold'),
+                Country.silver_count.label('silver'),
+                Country.bronze_count.label('bronze'),
+                country_points_expression().label('points'),
+            ))
+        }
     
     return render_template('countries.html',
                          countries_by_tier=countries_by_tier,
+                         medals=medals,
                          tier_6_warning=TIER_6_WARNING)
 
 
@@ -169,8 +295,7 @@ def country_detail(country_id):
     # Get users who picked this country (only after deadline)
     picked_by = []
     if is_picks_locked():
-        picks = Pick.query.filter_by(country_id=country_id).all()
-        picked_by = [pick.user for pick in picks]
+        picked_by = db.session.scalars(country_owners_select(country_id)).all()
     
     return render_template('country_detail.html',
                          country=country,
@@ -189,17 +314,10 @@ def rules():
 @app.route('/medals')
 def medals():
     """Medal tracker - all countries sorted by medal count."""
-    countries = Country.query.filter(
-        Country.is_active == True
-    ).all()
+    # Countries with medals, by gold, then silver, then bronze
+    medaled_countries = medal_table()
     
-    # Sort by gold, then silver, then bronze
-    countries.sort(key=lambda c: (c.gold_count, c.silver_count, c.bronze_count), reverse=True)
-    
-    # Filter to only those with medals for the "medal table" view
-    medaled_countries = [c for c in countries if c.total_medals > 0]
-    
-    game_state = GameState.get_instance()
+    game_state = current_game_state()
     
     return render_template('medals.html',
                          countries=medaled_countries,
@@ -339,50 +457,18 @@ def edit_picks():
             return redirect(url_for('edit_picks'))
         
         # Validate picks
-        is_valid, errors = validate_picks(current_user.id, picks_data)
+        is_valid, errors = validate_picks(current_user.id, picks_data, catalog=current_catalog())
         
         if not is_valid:
             for error in errors:
                 flash(error, 'error')
         else:
-            # Clear existing picks
-            Pick.query.filter_by(user_id=current_user.id).delete()
-            
-            # Save new picks
-            for tier, country_ids in picks_data.items():
-                for country_id in country_ids:
-                    pick = Pick(
-                        user_id=current_user.id,
-                        country_id=country_id,
-                        tier=tier,
-                    )
-                    db.session.add(pick)
-            
-            # Save or update tiebreaker
-            if current_user.tiebreaker:
-                current_user.tiebreaker.usa_gold = usa_gold
-                current_user.tiebreaker.usa_silver = usa_silver
-                current_user.tiebreaker.usa_bronze = usa_bronze
-            else:
-                tiebreaker = Tiebreaker(
-                    user_id=current_user.id,
-                    usa_gold=usa_gold,
-                    usa_silver=usa_silver,
-                    usa_bronze=usa_bronze,
-                )
-                db.session.add(tiebreaker)
-            
-            db.session.commit()
+            save_user_picks(current_user, picks_data, (usa_gold, usa_silver, usa_bronze))
             flash('Your picks have been saved!', 'success')
             return redirect(url_for('my_picks'))
     
     # Get countries by tier for selection
-    countries_by_tier = {}
-    for tier in range(1, 7):
-        countries_by_tier[tier] = Country.query.filter_by(
-            tier=tier,
-            is_active=True
-        ).order_by(Country.name).all()
+    countries_by_tier = current_catalog().active_by_tier()
     
     # Get user's current picks
     current_picks = {}
@@ -406,29 +492,47 @@ def edit_picks():
 def users():
     """List all registered users (names only, no picks until deadline)."""
     show_picks = is_picks_locked()
+    per_page = app.config['USERS_PER_PAGE']
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    total_users = User.query.count()
+    pages = max((total_users + per_page - 1) // per_page, 1)
+    page = min(page, pages)
+    offset = (page - 1) * per_page
+
+    # Page first, so roster status is only computed for the rows shown
+    page_users = (
+        select(User.__table__)
+        .order_by(User.created_at, User.id)
+        .limit(per_page)
+        .offset(offset)
+        .subquery()
+    )
+    status = user_status_select(page_users).subquery()
+    rows = db.session.execute(
+        select(status).order_by(status.c.created_at, status.c.id)
+    ).all()
 
-    all_users = User.query.options(
-        db.load_only(User.id, User.username, User.display_name, User.created_at, User.total_points),
-        db.noload(User.picks)
-    ).order_by(User.created_at).all()
-
-    users_data = []
-    for user in all_users:
-        pick_count = Pick.query.filter_by(user_id=user.id).count()
-        tiebreaker_exists = Tiebreaker.query.filter_by(user_id=user.id).first() is not None
-        ready = pick_count == TOTAL_PICKS and tiebreaker_exists
-        users_data.append({
-            'id': user.id,
-            'display_name': user.get_display_name(),
-            'created_at': user.created_at,
-            'ready': ready,
-            'is_current_user': current_user.is_authenticated and user.id == current_user.id,
-            'total_points': user.total_points if show_picks else None,
-        })
+    current_user_id = current_user.id if current_user.is_authenticated else None
+    users_data = [
+        {
+            'id': row.id,
+            'display_name': row.display_name,
+            'created_at': row.created_at,
+            'ready': bool(row.ready),
+            'is_current_user': row.id == current_user_id,
+            'total_points': row.total_points if show_picks else None,
+        }
+        for row in rows
+    ]
 
     return render_template('users.html',
                          users=users_data,
-                         show_picks=show_picks)
+                         show_picks=show_picks,
+                         total_users=total_users,
+                         page=page,
+                         pages=pages,
+                         offset=offset)
 
 
 @app.route('/user/<int:user_id>')
@@ -482,12 +586,10 @@ def admin_dashboard():
     """Admin dashboard."""
     total_users = User.query.count()
     ready_users = User.query.filter(User.picks.any()).count()
-    game_state = GameState.get_instance()
+    game_state = current_game_state()
     
     # Get total medals entered
-    total_medals = db.session.query(
-        func.sum(Country.gold_count + Country.silver_count + Country.bronze_count)
-    ).scalar() or 0
+    total_medals = db.session.query(func.sum(Country.total_medals)).scalar() or 0
     
     return render_template('admin/dashboard.html',
                          total_users=total_users,
@@ -501,6 +603,7 @@ def admin_dashboard():
 def admin_users():
     """Admin view of all users."""
     users = User.query.order_by(func.lower(User.username)).all()
+    prime_roster_status(users)
     return render_template('admin/users.html', users=users)
 
 
@@ -555,6 +658,7 @@ def admin_medals():
                 flash('No changes detected for this country.', 'info')
             else:
                 now = datetime.utcnow()
+                previous = (country.gold_count, country.silver_count, country.bronze_count)
                 audit_entry = MedalAudit(
                     country=country,
                     updated_by=current_user if current_user.is_authenticated else None,
@@ -576,7 +680,11 @@ def admin_medals():
                 game_state.medals_updated_at = now
 
                 try:
-                    calculate_all_scores(commit_session=False)
+                    rescore_country(country, previous, commit_session=False)
+                    refresh = refresh_leaderboard_snapshot(commit_session=False)
+                    publish_score_event('medals', refresh, countries=[
+                        {'code': country.code, 'gold': gold, 'silver': silver, 'bronze': bronze}
+                    ])
                     game_state.scores_calculated_at = now
                     db.session.add(audit_entry)
                     db.session.commit()
@@ -593,11 +701,50 @@ def admin_medals():
     return render_template('admin/medals.html', countries=countries)
 
 
+@app.route('/admin/medals/import', methods=['POST'])
+@admin_required
+def admin_import_medals():
+    """Apply a whole medal table (JSON body or CSV/JSON upload) with one rescore."""
+    allow_decrease = request.form.get('allow_decrease') == 'on' or request.args.get('allow_decrease') == '1'
+
+    try:
+        if request.is_json:
+            rows = parse_medal_table(request.get_data(as_text=True), 'json')
+        else:
+            upload = request.files.get('medal_file')
+            if not upload or not upload.filename:
+                flash('Choose a CSV or JSON file to import.', 'error')
+                return redirect(url_for('admin_medals'))
+            fmt = 'json' if upload.filename.lower().endswith('.json') else 'csv'
+            rows = parse_medal_table(upload.read().decode('utf-8-sig'), fmt)
+        changed, errors = apply_medal_table(
+            rows,
+            source='admin_import',
+            updated_by=current_user,
+            allow_decrease=allow_decrease,
+        )
+    except ValueError as exc:
+        changed, errors = [], [str(exc)]
+
+    if request.is_json:
+        return jsonify({'changed': changed, 'errors': errors}), (400 if errors else 200)
+
+    if errors:
+        for msg in errors:
+            flash(msg, 'error')
+    elif changed:
+        flash(f'Imported medals for {len(changed)} countries and recalculated scores.', 'success')
+    else:
+        flash('No changes detected in the imported medal table.', 'info')
+    return redirect(url_for('admin_medals'))
+
+
 @app.route('/admin/calculate', methods=['POST'])
 @admin_required
 def admin_calculate():
     """Recalculate all scores."""
-    calculate_all_scores()
+    calculate_all_scores(commit_session=False)
+    publish_score_event('scores', refresh_leaderboard_snapshot(commit_session=False))
     
     game_state = GameState.get_instance()
     game_state.scores_calculated_at = datetime.utcnow()
@@ -610,19 +757,75 @@ def admin_calculate():
 @app.route('/admin/picks')
 @admin_required
 def admin_picks():
-    """Admin view of all picks."""
-    users = User.query.filter(User.picks.any()).order_by(func.lower(User.username)).all()
-    
-    picks_data = []
-    for user in users:
-        picks_data.append({
-            'user': user,
-            'picks_by_tier': user.get_picks_by_tier(),
-            'tiebreaker': user.tiebreaker,
-            'total_points': user.total_points,
-        })
-    
-    return render_template('admin/picks.html', picks_data=picks_data)
+    """Admin view of all picks, streamed as rosters are read."""
+    return Response(
+        buffered_stream(stream_template('admin/picks.html', rosters=iter_rosters())),
+        mimetype='text/html',
+    )
+
+
+@app.route('/admin/export/<name>.<fmt>')
+@admin_required
+def admin_export(name, fmt):
+    """Download an export (see exports.py), streamed as it is read."""
+    if name not in EXPORTS or fmt not in EXPORT_FORMATS:
+        abort(404)
+    filename = f"olympics_pool_{name}_{get_current_time():%Y%m%d_%H%M}.{fmt}"
+    return Response(
+        stream_with_context(iter_export(name, fmt)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@app.route('/admin/profiling')
+@admin_required
+def admin_profiling():
+    """Slowest routes and requests recorded by the request profiler."""
+    return render_template(
+        'admin/profiling.html',
+        profiler=request_profiler,
+        route_stats=request_profiler.route_stats(),
+        slowest=request_profiler.slowest(),
+    )
+
+
+@app.route('/admin/profiling/reset', methods=['POST'])
+@admin_required
+def admin_profiling_reset():
+    """Clear the profiler's collected timings."""
+    request_profiler.reset()
+    flash('Profiling data cleared.', 'success')
+    return redirect(url_for('admin_profiling'))
+
+
+@app.route('/admin/simulation')
+@admin_required
+def admin_simulation():
+    """Win probabilities from the latest stored simulation."""
+    run = latest_simulation()
+    rows = simulation_rows(run.rows, limit=request.args.get('limit', 100, type=int)) if run else []
+    return render_template('admin/simulation.html', run=run, rows=rows,
+                           current_version=latest_score_version())
+
+
+@app.route('/admin/simulation/refresh', methods=['POST'])
+@admin_required
+def admin_simulation_refresh():
+    """
+    Re-run the simulation for the current scores with fresh samples.
+
+    Runs in the request, so it is capped at SIMULATION_REQUEST_SAMPLES in a
+    single process; full runs belong to `flask simulate --save` and the
+    medal feed poller.
+    """
+    samples = min(app.config['SIMULATION_SAMPLES'], app.config['SIMULATION_REQUEST_SAMPLES'])
+    try:
+        refresh_simulation(samples, app.config['SIMULATION_MODEL'], workers=1, force=True)
+        flash(f'Simulation refreshed with {samples} samples.', 'success')
+    except (SimulationUnavailable, ValueError) as e:
+        flash(f'Simulation failed: {e}', 'danger')
+    return redirect(url_for('admin_simulation'))
 
 
 # =============================================================================
@@ -630,20 +833,21 @@ def admin_picks():
 # =============================================================================
 
 @app.route('/api/leaderboard')
+@conditional_on_game_state('leaderboard')
 def api_leaderboard():
     """JSON endpoint for leaderboard data."""
     if not is_picks_locked():
         return jsonify({'error': 'Picks not yet locked'}), 403
     
     leaderboard_data = get_leaderboard()
-    game_state = GameState.get_instance()
+    game_state = current_game_state()
     
     return jsonify({
         'leaderboard': [
             {
-                'rank': entry['rank'],
-                'name': entry['user'].get_display_name(),
-                'points': entry['points'],
+                'rank': entry.rank,
+                'name': entry.display_name,
+                'points': entry.points,
             }
             for entry in leaderboard_data
         ],
@@ -651,16 +855,179 @@ def api_leaderboard():
     })
 
 
+@app.route('/api/user/<int:user_id>/history')
+@conditional_on_game_state('history')
+def api_user_history(user_id):
+    """
+    JSON rank-over-time series for one player.
+
+    Only versions where the player's points or rank changed are listed;
+    each value holds until the next entry.
+    """
+    if not is_picks_locked():
+        return jsonify({'error': 'Picks not yet locked'}), 403
+
+    user = User.query.get_or_404(user_id)
+    return jsonify({
+        'user_id': user.id,
+        'name': user.get_display_name(),
+        'history': [
+            {
+                'version': row.version,
+                'recorded_at': row.recorded_at.isoformat(),
+                'points': row.points,
+                'rank': row.rank,
+            }
+            for row in rank_history(user.id)
+        ],
+    })
+
+
+@app.route('/api/movers')
+@conditional_on_game_state('movers')
+def api_movers():
+    """
+    JSON list of the biggest rank changes since a score version.
+
+    Query params:
+        since: Version to compare against (default the previous one)
+        limit: Maximum number of players (default 10, at most 100)
+    """
+    if not is_picks_locked():
+        return jsonify({'error': 'Picks not yet locked'}), 403
+
+    since = request.args.get('since', type=int)
+    if since is None:
+        since = latest_score_version() - 1
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    return jsonify({
+        'since': since,
+        'movers': [
+            {
+                'user_id': row.user_id,
+                'name': row.display_name,
+                'rank': row.rank,
+                'previous_rank': row.previous_rank,
+                'change': row.change,
+                'points': row.points,
+                'previous_points': row.previous_points,
+            }
+            for row in biggest_movers(since, limit)
+        ],
+    })
+
+
+def _simulation_validator():
+    """ETag key for /api/simulation: the stored run, which changes on re-runs."""
+    run = db.session.execute(
+        select(SimulationRun.id, SimulationRun.created_at)
+        .order_by(SimulationRun.id.desc()).limit(1)
+    ).first()
+    g.simulation_run_id = run.id if run else None
+    return (f'r{run.id}', run.created_at) if run else ('none', None)
+
+
+@app.route('/api/simulation')
+@conditional_on_game_state('simulation', validator=_simulation_validator)
+def api_simulation():
+    """
+    JSON win probabilities and expected finishes from the latest stored run.
+
+    Runs are computed by background jobs (see simulation.refresh_simulation),
+    never here; until the first one exists this answers 503.
+
+    Query params:
+        limit: Maximum number of players (default 100)
+    """
+    if not is_picks_locked():
+        return jsonify({'error': 'Picks not yet locked'}), 403
+
+    run = db.session.get(SimulationRun, g.simulation_run_id) if g.simulation_run_id else None
+    if run is None:
+        return jsonify({'error': 'Simulation pending'}), 503
+
+    return jsonify({
+        'version': run.version,
+        'current': run.version == latest_score_version(),
+        'samples': run.samples,
+        'model': run.model,
+        'generated_at': run.created_at.isoformat(),
+        'players': simulation_rows(run.rows, limit=request.args.get('limit', 100, type=int)),
+    })
+
+
+@app.route('/api/stream')
+def api_stream():
+    """
+    Server-Sent Events stream of score changes.
+
+    Clients resume with the Last-Event-ID header (or ?last_event_id=); new
+    clients only receive events published after they connect. Each
+    connection is closed after SSE_MAX_DURATION seconds and EventSource
+    reconnects transparently, so a worker is never held indefinitely.
+
+    Disabled (404) unless SSE_ENABLED is set: it is meant for async workers,
+    where a held connection does not tie up a whole worker process.
+    """
+    if not app.config['SSE_ENABLED']:
+        abort(404)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id)
+    except (TypeError, ValueError):
+        last_event_id = db.session.query(func.max(ScoreEvent.id)).scalar() or 0
+
+    poll_interval = app.config['SSE_POLL_INTERVAL']
+    heartbeat_interval = app.config['SSE_HEARTBEAT_INTERVAL']
+    max_duration = app.config['SSE_MAX_DURATION']
+
+    def generate(last_id):
+        started = last_beat = time.monotonic()
+        yield f'retry: {int(poll_interval * 1000)}\n\n'
+        while time.monotonic() - started < max_duration:
+            events = db.session.execute(
+                select(ScoreEvent.id, ScoreEvent.kind, ScoreEvent.payload)
+                .where(ScoreEvent.id > last_id)
+                .order_by(ScoreEvent.id)
+            ).all()
+            # Don't hold a read transaction open while sleeping
+            db.session.close()
+
+            for event_id, kind, payload in events:
+                last_id = event_id
+                yield f'id: {event_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+            now = time.monotonic()
+            if not events and now - last_beat >= heartbeat_interval:
+                yield ': keep-alive\n\n'
+                last_beat = now
+            time.sleep(poll_interval)
+
+    return Response(
+        stream_with_context(generate(last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @app.route('/api/medals')
+@conditional_on_game_state('medals')
 def api_medals():
-    """JSON endpoint for medal counts."""
-    countries = Country.query.filter(
-        (Country.gold_count + Country.silver_count + Country.bronze_count) > 0
-    ).all()
-    
-    countries.sort(key=lambda c: (c.gold_count, c.silver_count, c.bronze_count), reverse=True)
+    """
+    JSON endpoint for medal counts.
+
+    Query params:
+        sort: 'medals' (default, medal table order) or 'points'
+        limit: Return only the first N countries
+    """
+    order = request.args.get('sort', 'medals')
+    if order not in ('medals', 'points'):
+        abort(400)
+    limit = request.args.get('limit', type=int)
+    countries = medal_table(limit=limit, order=order, active_only=False)
     
-    game_state = GameState.get_instance()
+    game_state = current_game_state()
     
     return jsonify({
         'medals': [
@@ -671,6 +1038,7 @@ def api_medals():
                 'silver': c.silver_count,
                 'bronze': c.bronze_count,
                 'total': c.total_medals,
+                'points': c.points,
             }
             for c in countries
         ],
@@ -685,11 +1053,21 @@ def api_medals():
 @app.cli.command('init-db')
 def init_db():
     """Initialize the database."""
-    db.create_all()
+    upgrade_database()
     GameState.get_instance()  # Create game state singleton
     print('Database initialized.')
 
 
+@app.cli.command('upgrade-db')
+def upgrade_db_cmd():
+    """Apply pending schema migrations and list their status."""
+    # Normally already applied when the app started
+    for migration in upgrade_database():
+        print(f'Applied {migration.version}: {migration.name}')
+    for migration, applied in migration_status():
+        print(f"{'applied' if applied else 'pending':<9}{migration.version:>3}  {migration.name}")
+
+
 @app.cli.command('create-admin')
 def create_admin():
     """Create an admin user."""
@@ -716,10 +1094,225 @@ def create_admin():
 
 
 @app.cli.command('calculate-scores')
-def calculate_scores_cmd():
+@click.option('--engine', type=click.Choice(sorted(SCORING_ENGINES)), default='sql',
+              help='Scoring engine to use.')
+def calculate_scores_cmd(engine):
     """Recalculate all user scores."""
-    calculate_all_scores()
-    print('Scores recalculated.')
+    try:
+        calculate_all_scores(commit_session=False, engine=engine)
+    except NumpyUnavailable as e:
+        print(f'Error: {e}')
+        raise SystemExit(1)
+    publish_score_event('scores', refresh_leaderboard_snapshot(commit_session=False))
+    GameState.get_instance().scores_calculated_at = datetime.utcnow()
+    db.session.commit()
+    print(f'Scores recalculated ({engine} engine).')
+
+
+@app.cli.command('lock-picks')
+def lock_picks_cmd():
+    """Rescore and rebuild the leaderboard once picks have locked."""
+    if not is_picks_locked():
+        print(f"Picks are still open until {PICK_DEADLINE.strftime('%B %d, %Y at %I:%M %p %Z')}.")
+        raise SystemExit(1)
+    refresh = refresh_scores_at_lock()
+    if refresh is None:
+        print('Leaderboard already rebuilt since the deadline.')
+    else:
+        print(f'Scores recalculated; leaderboard version {refresh.version} has {len(refresh.changed)} changed rows.')
+
+
+@app.cli.command('import-medals')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'json']), default=None,
+              help='File format (defaults to the file extension).')
+@click.option('--allow-decrease', is_flag=True, help='Allow medal count corrections downwards.')
+@click.option('--dry-run', is_flag=True, help='Validate and report changes without writing.')
+def import_medals_cmd(path, fmt, allow_decrease, dry_run):
+    """Apply a CSV/JSON medal table with a single rescore."""
+    fmt = fmt or ('json' if path.lower().endswith('.json') else 'csv')
+    with open(path, encoding='utf-8-sig') as f:
+        payload = f.read()
+
+    try:
+        rows = parse_medal_table(payload, fmt)
+    except ValueError as exc:
+        print(f'Error: {exc}')
+        raise SystemExit(1)
+
+    changed, errors = apply_medal_table(
+        rows, source='cli_import', allow_decrease=allow_decrease, dry_run=dry_run,
+    )
+    if errors:
+        for msg in errors:
+            print(msg)
+        print('Import aborted; no changes written.')
+        raise SystemExit(1)
+    if not changed:
+        print('No changes detected.')
+    elif dry_run:
+        print(f'Would update {len(changed)} countries: {", ".join(changed)}')
+    else:
+        print(f'Updated {len(changed)} countries and recalculated scores: {", ".join(changed)}')
+
+
+@app.cli.command('poll-medals')
+@click.option('--url', default=None, help='Medal feed URL (defaults to MEDAL_FEED_URL).')
+@click.option('--interval', type=float, default=None,
+              help='Seconds between polls (defaults to MEDAL_FEED_INTERVAL).')
+@click.option('--once', is_flag=True, help='Poll a single time and exit.')
+def poll_medals_cmd(url, interval, once):
+    """Poll the medal feed and apply changes as they arrive."""
+    from medal_feed import MedalFeedPoller
+
+    url = url or app.config['MEDAL_FEED_URL']
+    if not url:
+        print('No feed URL: pass --url or set MEDAL_FEED_URL.')
+        raise SystemExit(1)
+
+    def update_simulation():
+        try:
+            run = refresh_simulation(app.config['SIMULATION_SAMPLES'], app.config['SIMULATION_MODEL'],
+                                     app.config['SIMULATION_WORKERS'])
+        except (SimulationUnavailable, ValueError) as e:
+            print(f'Simulation skipped: {e}')
+            return
+        if run is not None:
+            print(f'Simulation refreshed for score version {run.version} ({run.duration_ms} ms).')
+
+    poller = MedalFeedPoller(
+        url,
+        timeout=app.config['MEDAL_FEED_TIMEOUT'],
+        allow_decrease=app.config['MEDAL_FEED_ALLOW_DECREASE'],
+        on_update=update_simulation,
+    )
+    print(f'Polling {url}' + ('' if once else f" every {interval or app.config['MEDAL_FEED_INTERVAL']}s"))
+    try:
+        poller.run(interval or app.config['MEDAL_FEED_INTERVAL'], max_polls=1 if once else None)
+    except KeyboardInterrupt:
+        print('Stopped.')
+
+
+@app.cli.command('verify-scores')
+@click.option('--engine', type=click.Choice(sorted(SCORING_ENGINES)), default='sql',
+              help='Engine to check against the ORM reference.')
+@click.option('--synthetic-users', type=int, default=0,
+              help='Add this many synthetic users (rolled back afterwards).')
+@click.option('--seed', type=int, default=2026, help='Random seed for the synthetic pool.')
+def verify_scores_cmd(engine, synthetic_users, seed):
+    """Check that a scoring engine matches the ORM path. Never commits."""
+    from synthetic_pool import populate_synthetic_pool
+
+    try:
+        if synthetic_users:
+            populate_synthetic_pool(synthetic_users, seed=seed)
+        mismatches = compare_scoring_engines(engine)
+        users_checked = User.query.count()
+    except NumpyUnavailable as e:
+        print(f'Error: {e}')
+        raise SystemExit(1)
+    finally:
+        db.session.rollback()
+
+    if mismatches:
+        for line in mismatches[:20]:
+            print(line)
+        print(f'{len(mismatches)} mismatches between orm and {engine}.')
+        raise SystemExit(1)
+    print(f'{engine} engine matches orm for {users_checked} users.')
+
+
+@app.cli.command('export')
+@click.argument('name', type=click.Choice(sorted(EXPORTS)))
+@click.option('--format', 'fmt', type=click.Choice(sorted(EXPORT_FORMATS)), default='csv',
+              help='Output format.')
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-',
+              help='File to write (default: stdout).')
+def export_cmd(name, fmt, output):
+    """Export rosters or picks as CSV or newline-delimited JSON."""
+    for chunk in iter_export(name, fmt):
+        output.write(chunk)
+
+
+@app.cli.command('check-query-budgets')
+def check_query_budgets_cmd():
+    """Check every page against its SQL query budget on the current database."""
+    from query_budget import check_route_budgets, format_budget_results
+
+    admin_id = db.session.scalar(select(User.id).where(User.is_admin == True).limit(1))
+    player_id = db.session.scalar(select(User.id).where(User.picks.any()).limit(1))
+    country_id = db.session.scalar(
+        select(Pick.country_id).group_by(Pick.country_id).order_by(func.count().desc()).limit(1)
+    )
+    if admin_id is None or player_id is None:
+        print('Need at least one admin and one user with picks.')
+        raise SystemExit(1)
+    db.session.remove()
+
+    results = check_route_budgets(
+        app,
+        viewers={'player': player_id, 'admin': admin_id},
+        params={'country_id': country_id, 'user_id': player_id},
+    )
+    for line in format_budget_results(results):
+        print(line)
+
+    errors = [result for result in results if result.error]
+    over = [result for result in results if result.over_budget]
+    if errors:
+        print(f'{len(errors)} routes did not answer 200 and were not measured.')
+    if over:
+        print(f'{len(over)} routes over budget.')
+    if errors or over:
+        raise SystemExit(1)
+    print('All query budgets met.')
+
+
+@app.cli.command('simulate')
+@click.option('--samples', type=int, default=10000, show_default=True,
+              help='Number of simulated final medal tables.')
+@click.option('--model', 'model_path', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='CSV/JSON of expected final medal counts (default: project current pace).')
+@click.option('--workers', type=int, default=None, help='Processes to use (default: one per CPU).')
+@click.option('--seed', type=int, default=None, help='Random seed for a reproducible run.')
+@click.option('--top', type=int, default=20, show_default=True, help='Players to print.')
+@click.option('--save', is_flag=True,
+              help='Store as the run served by /admin/simulation and /api/simulation.')
+def simulate_cmd(samples, model_path, workers, seed, top, save):
+    """Monte Carlo win probabilities over the medals still to be won."""
+    try:
+        result = simulate(samples, model_path or app.config['SIMULATION_MODEL'], workers, seed)
+    except (SimulationUnavailable, ValueError) as e:
+        print(f'Error: {e}')
+        raise SystemExit(1)
+
+    if save:
+        save_simulation(result)
+    print(f'{result.samples} samples, {result.model} model, {result.duration_ms} ms')
+    print(f"{'Rank':>5}  {'Player':<30}{'Points':>7}{'Win %':>8}{'Exp. finish':>13}")
+    for row in simulation_rows(result.rows, limit=top):
+        print(f"{row['rank'] or '-':>5}  {(row['name'] or '?')[:29]:<30}{row['points'] or 0:>7}"
+              f"{row['win_probability'] * 100:>8.1f}{row['expected_rank']:>13.1f}")
+    if save:
+        print('Saved as the latest simulation.')
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans_cmd():
+    """Check that hot queries are answered from their indexes."""
+    from query_plans import check_query_plans
+
+    failed = 0
+    for result in check_query_plans():
+        print(f"{'ok' if result.passed else 'FAIL':<6}{result.check.label:<34}"
+              f"{result.check.index}")
+        for detail in result.plan:
+            print(f"        {detail}")
+        failed += not result.passed
+    if failed:
+        print(f'{failed} queries not using their index.')
+        raise SystemExit(1)
+    print('All query plans use their indexes.')
 
 
 # =============================================================================
@@ -0,0 +1,7 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Benchmarks
+======================================================
+Standalone performance scripts. Run from the project root, e.g.:
+
+    python -m benchmarks.sqlite_concurrency
+"""
@@ -0,0 +1,106 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Benchmark Helpers
+=============================================================
+Shared setup for the benchmark scripts: a throwaway SQLite database with a
+seeded catalog and a scored synthetic pool, built in a forked process per
+pool size.
+
+The app reads DATABASE_URL when it is imported, so call use_database()
+before anything imports app or models.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import time
+
+BENCH_ADMIN = 'bench_admin'
+
+
+def use_database(path: str) -> None:
+    """Point the app (imported afterwards) at a SQLite file."""
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ['FLASK_ENV'] = 'development'
+
+
+def build_database(num_users: int, seed: int = 2026) -> dict:
+    """
+    Create the schema, seed the real country catalog and add a scored
+    synthetic pool of num_users plus one admin account.
+
+    Returns:
+        {'admin_id': ..., 'build_s': seconds spent}
+    """
+    from app import app
+    from models import (
+        db, GameState, User, calculate_all_scores, refresh_leaderboard_snapshot,
+    )
+    from migrations import upgrade_database
+    from seed_data import seed_countries
+    from synthetic_pool import populate_synthetic_pool
+
+    started = time.perf_counter()
+    with app.app_context():
+        upgrade_database()
+        GameState.get_instance()
+        db.session.commit()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_countries()
+
+    with app.app_context():
+        populate_synthetic_pool(num_users, seed=seed)
+        admin = User(username=BENCH_ADMIN, email=f'{BENCH_ADMIN}@example.com', is_admin=True)
+        admin.set_password(BENCH_ADMIN)
+        db.session.add(admin)
+        calculate_all_scores(commit_session=False)
+        refresh_leaderboard_snapshot(commit_session=False)
+        db.session.commit()
+        admin_id = admin.id
+        db.session.remove()
+        db.engine.dispose()
+
+    return {'admin_id': admin_id, 'build_s': round(time.perf_counter() - started, 3)}
+
+
+def run_in_child(func, *args) -> dict:
+    """
+    Run func(*args) in a forked process and return its (picklable) result,
+    or {'error': ...} if it raised or died. Used to give every pool size a
+    fresh database, fresh process caches and its own peak RSS.
+    """
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+
+    def target():
+        try:
+            from app import app
+            from models import db
+
+            # Forget connections to any previous database file
+            with app.app_context():
+                db.engine.dispose()
+            results.put(func(*args))
+        except Exception as exc:
+            results.put({'error': repr(exc)})
+
+    worker = ctx.Process(target=target)
+    worker.start()
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1)
+        except queue.Empty:
+            if not worker.is_alive():
+                result = {'error': f'worker exited with code {worker.exitcode}'}
+    worker.join()
+    return result
+
+
+def reset_database_file(path: str) -> None:
+    """Delete a SQLite database file and its WAL/shared-memory files."""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
@@ -0,0 +1,115 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Query Budget Check
+==============================================================
+Enforce query_budget.ROUTE_BUDGETS on synthetic pools of several sizes.
+
+A route fails when it exceeds its budget at any size. Routes whose query
+count changes with pool size are flagged as well, since that is an N+1
+even while the count is still under budget. Routes marked known_issue are
+reported but do not fail. Exits non-zero on failure, so it can run in CI.
+
+Usage:
+    python -m benchmarks.query_budgets
+    python -m benchmarks.query_budgets --sizes 10 100 1000 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks.common import use_database, build_database, run_in_child, reset_database_file
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def check_pool(num_users: int) -> dict:
+    """Build a pool of num_users and check every route budget against it."""
+    from sqlalchemy import func, select
+
+    from app import app
+    from models import db, Pick, User
+    from query_budget import check_route_budgets, format_budget_results
+    from simulation import SimulationUnavailable, refresh_simulation
+
+    db_info = build_database(num_users)
+    with app.app_context():
+        player_id = db.session.scalar(
+            select(User.id).where(User.picks.any()).order_by(User.id).limit(1)
+        )
+        # The most picked country has the longest "picked by" list
+        country_id = db.session.scalar(
+            select(Pick.country_id).group_by(Pick.country_id)
+            .order_by(func.count().desc()).limit(1)
+        )
+        # Simulations are stored by background jobs, never run by a request
+        try:
+            refresh_simulation(200, workers=1)
+        except SimulationUnavailable:
+            pass
+        db.session.remove()
+
+    results = check_route_budgets(
+        app,
+        viewers={'player': player_id, 'admin': db_info['admin_id']},
+        params={'country_id': country_id, 'user_id': player_id},
+    )
+    return {
+        'lines': format_budget_results(results),
+        'counts': {(r.budget.viewer, r.budget.path): r.queries for r in results},
+        'failed': [f"{r.budget.viewer} {r.path}" for r in results if r.failed],
+        'known_issues': {(r.budget.viewer, r.budget.path) for r in results if r.budget.known_issue},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Check per-route SQL query budgets.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Synthetic pool sizes (users)')
+    args = parser.parse_args(argv)
+
+    failures = []
+    counts_by_size = {}
+    known_issues = set()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'budget.db')
+        use_database(db_path)
+        import app  # noqa: F401  (create the app before forking)
+
+        for size in args.sizes:
+            reset_database_file(db_path)
+            print(f"\n{size} users")
+            result = run_in_child(check_pool, size)
+            if 'error' in result:
+                print(f"  failed: {result['error']}")
+                failures.append(f"{size} users: {result['error']}")
+                continue
+            for line in result['lines']:
+                print(f"  {line}")
+            failures += [f"{size} users: {route}" for route in result['failed']]
+            counts_by_size[size] = result['counts']
+            known_issues |= result['known_issues']
+
+    # Counts must not depend on pool size
+    if len(counts_by_size) > 1:
+        routes = next(iter(counts_by_size.values())).keys()
+        for route in routes:
+            counts = [counts[route] for counts in counts_by_size.values()]
+            if len(set(counts)) > 1 and route not in known_issues:
+                failures.append(
+                    f"{route[0]} {route[1]} scales with pool size: "
+                    + ', '.join(f"{size}={counts[route]}" for size, counts in counts_by_size.items())
+                )
+
+    if failures:
+        print("\nQuery budget check failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nAll query budgets met.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Scaling Benchmark
+=============================================================
+Time the scoring and leaderboard hot paths on synthetic pools of growing
+size and write the results to a JSON file that later runs can be compared
+against.
+
+For every pool size a fresh database is built in a forked child process, so
+caches and peak RSS are per size. Each operation is run --repeat times and
+reports wall time (first run = cold caches), SQL statement count and peak
+Python memory (tracemalloc, measured in one extra run).
+
+/api/stream is left out: it is a long-lived SSE response, not a request.
+
+Usage:
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --sizes 1000 10000 --repeat 5 --output before.json
+    python -m benchmarks.scaling --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.common import use_database, build_database, run_in_child, reset_database_file
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+ROUTES = (
+    '/leaderboard',
+    '/users',
+    '/admin/picks',
+    '/api/leaderboard',
+    '/api/medals',
+)
+
+
+def measure(engine, func, repeat: int) -> dict:
+    """Run func repeat times, then once more under tracemalloc."""
+    from query_budget import QueryCounter
+
+    runs = []
+    queries = None
+    for _ in range(repeat):
+        with QueryCounter(engine) as counter:
+            started = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - started)
+        queries = counter.count
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'runs_s': [round(run, 5) for run in runs],
+        'first_s': round(runs[0], 5),
+        'median_s': round(statistics.median(runs), 5),
+        'min_s': round(min(runs), 5),
+        'queries': queries,
+        'peak_mem_kb': peak // 1024,
+    }
+
+
+def benchmark_pool(num_users: int, repeat: int, engines: list[str]) -> dict:
+    """Build a pool of num_users and measure every operation against it."""
+    from app import app
+    from models import db, calculate_all_scores, refresh_leaderboard_snapshot, get_leaderboard
+
+    db_info = build_database(num_users)
+    operations = {}
+
+    with app.app_context():
+        engine = db.engine
+
+        def in_session(func):
+            def run():
+                try:
+                    func()
+                finally:
+                    db.session.remove()
+            return run
+
+        for scoring_engine in engines:
+            operations[f'calculate_all_scores[{scoring_engine}]'] = measure(
+                engine, in_session(lambda: calculate_all_scores(engine=scoring_engine)), repeat,
+            )
+        operations['refresh_leaderboard_snapshot'] = measure(
+            engine, in_session(refresh_leaderboard_snapshot), repeat,
+        )
+        operations['get_leaderboard'] = measure(
+            engine, in_session(get_leaderboard), repeat,
+        )
+        operations['get_leaderboard[limit=10]'] = measure(
+            engine, in_session(lambda: get_leaderboard(limit=10)), repeat,
+        )
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(db_info['admin_id'])
+        session['_fresh'] = True
+
+    for path in ROUTES:
+        def get(path=path):
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+            # Drain streamed bodies without keeping them
+            for _ in response.iter_encoded():
+                pass
+            response.close()
+        operations[f'GET {path}'] = measure(engine, get, repeat)
+
+    return {
+        'users': num_users,
+        'build_s': db_info['build_s'],
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'operations': operations,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print median-time and query-count changes against an earlier run."""
+    with open(baseline_path) as f:
+        baseline = {pool['users']: pool for pool in json.load(f)['pools']}
+
+    print(f"\nCompared with {baseline_path} (median time, queries):")
+    for pool in results['pools']:
+        before = baseline.get(pool['users'])
+        if not before or 'operations' not in pool or 'operations' not in before:
+            continue
+        print(f"  {pool['users']} users")
+        for name, op in pool['operations'].items():
+            old = before['operations'].get(name)
+            if old is None:
+                continue
+            ratio = op['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+            print(f"    {name:<40}{ratio:>7.2f}x  queries {old['queries']} -> {op['queries']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Scoring and leaderboard scaling benchmark.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Synthetic pool sizes (users)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per operation')
+    parser.add_argument('--engine', dest='engines', action='append',
+                        help="Scoring engine(s) to time (default: 'sql')")
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--compare', dest='baseline', help='Earlier results file to compare with')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        use_database(db_path)
+        import app  # noqa: F401  (create the app before forking)
+
+        pools = []
+        for size in args.sizes:
+            reset_database_file(db_path)
+            print(f"Benchmarking {size} users...")
+            pool = run_in_child(benchmark_pool, size, args.repeat, args.engines or ['sql'])
+            pool.setdefault('users', size)
+            pools.append(pool)
+
+            if 'error' in pool:
+                print(f"  failed: {pool['error']}")
+                continue
+            for name, op in pool['operations'].items():
+                print(f"  {name:<40}{op['median_s'] * 1000:>10.1f} ms{op['queries']:>6} queries"
+                      f"{op['peak_mem_kb']:>9} KB")
+
+    results = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'pools': pools,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+    return 0 if all('error' not in pool for pool in pools) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - SQLite Concurrency Benchmark
+========================================================================
+Measure leaderboard read throughput while a writer keeps applying medal
+updates, once with SQLite's defaults (rollback journal) and once with the
+production PRAGMA profile (WAL, busy_timeout, synchronous=NORMAL, ...).
+
+Each reader and the writer is a separate process, like gunicorn workers.
+
+Usage:
+    python -m benchmarks.sqlite_concurrency
+    python -m benchmarks.sqlite_concurrency --users 10000 --readers 8 --duration 10
+    python -m benchmarks.sqlite_concurrency --json results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.common import use_database, build_database
+
+PROFILES = ('default', 'production')
+
+
+def profile_pragmas(profile: str) -> dict:
+    """PRAGMAs applied by each connection under a profile."""
+    from config import ProductionConfig
+
+    if profile == 'production':
+        return ProductionConfig.SQLITE_PRAGMAS
+    return {'journal_mode': 'DELETE'}
+
+
+def _prepare_worker(pragmas: dict) -> None:
+    """Drop connections inherited from the parent and apply the profile."""
+    from models import db, install_sqlite_pragmas
+
+    db.engine.dispose()
+    install_sqlite_pragmas(db.engine, pragmas)
+
+
+def reader(pragmas: dict, deadline: float, results) -> None:
+    """Render the top of the leaderboard in a loop, one transaction per read."""
+    from app import app
+    from models import db, get_leaderboard
+
+    reads = errors = 0
+    latencies = []
+    with app.app_context():
+        _prepare_worker(pragmas)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                get_leaderboard(limit=50)
+                reads += 1
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+            finally:
+                db.session.remove()
+    results.put(('reader', reads, errors, max(latencies, default=0.0)))
+
+
+def writer(pragmas: dict, deadline: float, results) -> None:
+    """Apply single-country medal updates and full rescoring in a loop."""
+    from app import app
+    from models import db, Country, calculate_all_scores, refresh_leaderboard_snapshot
+
+    rng = random.Random(2026)
+    writes = errors = 0
+    with app.app_context():
+        _prepare_worker(pragmas)
+        country_ids = [country_id for (country_id,) in db.session.query(Country.id)]
+        while time.monotonic() < deadline:
+            try:
+                country = db.session.get(Country, rng.choice(country_ids))
+                country.gold_count += 1
+                calculate_all_scores(commit_session=False)
+                refresh_leaderboard_snapshot(commit_session=False)
+                db.session.commit()
+                writes += 1
+            except Exception:
+                db.session.rollback()
+                errors += 1
+            finally:
+                db.session.remove()
+    results.put(('writer', writes, errors, 0.0))
+
+
+def run_profile(db_path: str, profile: str, readers: int, duration: float) -> dict:
+    """Run readers and one writer concurrently and summarize throughput."""
+    pragmas = profile_pragmas(profile)
+
+    # journal_mode is persistent in the file; switch it before workers start
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(f"PRAGMA journal_mode={pragmas.get('journal_mode', 'DELETE')}")
+
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+    deadline = time.monotonic() + duration
+    workers = [ctx.Process(target=writer, args=(pragmas, deadline, results))]
+    workers += [ctx.Process(target=reader, args=(pragmas, deadline, results)) for _ in range(readers)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    reads = sum(count for role, count, _, _ in outcomes if role == 'reader')
+    return {
+        'profile': profile,
+        'readers': readers,
+        'duration_s': duration,
+        'reads': reads,
+        'reads_per_s': round(reads / duration, 1),
+        'read_errors': sum(err for role, _, err, _ in outcomes if role == 'reader'),
+        'max_read_latency_ms': round(
+            max(latency for role, _, _, latency in outcomes if role == 'reader') * 1000, 1
+        ),
+        'writes': sum(count for role, count, _, _ in outcomes if role == 'writer'),
+        'write_errors': sum(err for role, _, err, _ in outcomes if role == 'writer'),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Leaderboard read throughput under a concurrent writer, per SQLite profile.'
+    )
+    parser.add_argument('--users', type=int, default=2000, help='Synthetic pool size')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader processes')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+    parser.add_argument('--json', dest='json_path', help='Also write results to this file')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        use_database(db_path)
+
+        print(f"Building pool of {args.users} synthetic users...")
+        build_database(args.users)
+
+        results = []
+        for profile in PROFILES:
+            print(f"Running '{profile}' profile for {args.duration:g}s "
+                  f"({args.readers} readers, 1 writer)...")
+            results.append(run_profile(db_path, profile, args.readers, args.duration))
+
+    print()
+    print(f"{'Profile':<12}{'Reads/s':>10}{'Read err':>10}{'Max read ms':>13}{'Writes':>8}{'Write err':>11}")
+    for r in results:
+        print(f"{r['profile']:<12}{r['reads_per_s']:>10}{r['read_errors']:>10}"
+              f"{r['max_read_latency_ms']:>13}{r['writes']:>8}{r['write_errors']:>11}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'users': args.users, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Country Catalog
+===========================================================
+Immutable in-memory copy of the countries table's static data.
+
+The catalog (code, name, tier, multiplier, ISO code, flags) is built once
+per process and rebuilt only when game_state.catalog_version moves, which
+happens whenever a country is added, removed, renamed, re-tiered or
+(de)activated. Medal counts are deliberately not part of it.
+"""
+
+import threading
+
+from sqlalchemy import select
+
+from config import TIERS
+from data.countries import IOC_TO_ISO
+from models import db, Country, get_game_state
+
+
+class CatalogCountry:
+    """Read-only country record."""
+
+    __slots__ = ('id', 'code', 'name', 'tier', 'multiplier', 'iso_code',
+                 'is_active', 'has_medaled_2010_2022')
+
+    def __init__(self, id, code, name, tier, is_active, has_medaled_2010_2022):
+        values = {
+            'id': id,
+            'code': code,
+            'name': name,
+            'tier': tier,
+            'multiplier': TIERS.get(tier, {}).get('multiplier', 1),
+            'iso_code': IOC_TO_ISO.get((code or '').upper(), ''),
+            'is_active': bool(is_active),
+            'has_medaled_2010_2022': bool(has_medaled_2010_2022),
+        }
+        for name_, value in values.items():
+            object.__setattr__(self, name_, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CatalogCountry is immutable')
+
+    @property
+    def tier_name(self) -> str:
+        return TIERS.get(self.tier, {}).get('name', 'Unknown')
+
+    def __repr__(self):
+        return f'<CatalogCountry {self.code} ({self.name}) - Tier {self.tier}>'
+
+
+class CountryCatalog:
+    """All countries indexed by id, code and tier."""
+
+    __slots__ = ('version', 'by_id', 'by_code', '_active_by_tier')
+
+    def __init__(self, version: int, countries):
+        by_id = {country.id: country for country in countries}
+        active_by_tier = {tier: [] for tier in TIERS}
+        for country in sorted(by_id.values(), key=lambda c: c.name):
+            if country.is_active:
+                active_by_tier.setdefault(country.tier, []).append(country)
+
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'by_id', by_id)
+        object.__setattr__(self, 'by_code', {country.code: country for country in countries})
+        object.__setattr__(self, '_active_by_tier', {
+            tier: tuple(members) for tier, members in active_by_tier.items()
+        })
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CountryCatalog is immutable')
+
+    def get(self, country_id):
+        """Country by id, or None."""
+        return self.by_id.get(country_id)
+
+    def active_in_tier(self, tier: int) -> tuple:
+        """Active countries of a tier, sorted by name."""
+        return self._active_by_tier.get(tier, ())
+
+    def active_by_tier(self) -> dict:
+        """{tier: (countries...)} for every configured tier."""
+        return {tier: self.active_in_tier(tier) for tier in TIERS}
+
+    def __len__(self):
+        return len(self.by_id)
+
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def load_country_catalog(version: int) -> CountryCatalog:
+    """Build a catalog from the countries table."""
+    rows = db.session.execute(select(
+        Country.id, Country.code, Country.name, Country.tier,
+        Country.is_active, Country.has_medaled_2010_2022,
+    )).all()
+    return CountryCatalog(version, [CatalogCountry(*row) for row in rows])
+
+
+def get_country_catalog(version: int = None) -> CountryCatalog:
+    """
+    Return the process-wide catalog for the given catalog version.
+
+    Pass the catalog_version of an already fetched game state to avoid any
+    query; otherwise the (cached) game state is consulted.
+    """
+    if version is None:
+        version = get_game_state().catalog_version
+
+    catalog = _cache.get('catalog')
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    with _lock:
+        catalog = _cache.get('catalog')
+        if catalog is None or catalog.version != version:
+            catalog = load_country_catalog(version)
+            # An empty table is most likely "not seeded yet"; don't pin it
+            if len(catalog):
+                _cache['catalog'] = catalog
+    return catalog
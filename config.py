@@ -46,6 +46,10 @@ TIERS = {
     6: {'name': 'Wildcard', 'multiplier': 20, 'picks': 2},
 }
 
+# Medal events at Milano-Cortina 2026 (one gold per event), used by the
+# win-probability simulator to project the medals still to be awarded
+MEDAL_EVENTS = 116
+
 # Total picks required
 TOTAL_PICKS = sum(tier['picks'] for tier in TIERS.values())  # = 8
 
@@ -79,9 +83,49 @@ class Config:
         'sqlite:///' + os.path.join(BASE_DIR, 'olympics_pool.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # PRAGMAs applied to every SQLite connection (see models.install_sqlite_pragmas)
+    SQLITE_PRAGMAS = {}
+    
     # Session
     PERMANENT_SESSION_LIFETIME = 60 * 60 * 24 * 30  # 30 days
     
+    # Seconds a worker trusts its cached game state before re-checking the
+    # version counter (0 = check on every request)
+    GAME_STATE_CACHE_TTL = 0
+    
+    # Medal feed poller (flask poll-medals)
+    MEDAL_FEED_URL = os.environ.get('MEDAL_FEED_URL')
+    MEDAL_FEED_INTERVAL = int(os.environ.get('MEDAL_FEED_INTERVAL', 60))  # seconds
+    MEDAL_FEED_TIMEOUT = 10  # seconds
+    MEDAL_FEED_ALLOW_DECREASE = False
+    
+    # Server-Sent Events (/api/stream). Each open stream holds a worker for
+    # up to SSE_MAX_DURATION, so only enable it with an async worker class
+    # (gunicorn -k gevent); otherwise the leaderboard reloads every 5 minutes.
+    SSE_ENABLED = os.environ.get('SSE_ENABLED', '').lower() in ('1', 'true', 'yes')
+    # In seconds
+    SSE_POLL_INTERVAL = 2
+    SSE_HEARTBEAT_INTERVAL = 15
+    SSE_MAX_DURATION = 300
+    
+    # Memory cap for rendered leaderboard fragments (per worker)
+    FRAGMENT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    
+    # Win-probability simulator (flask simulate, /admin/simulation); needs NumPy.
+    # SIMULATION_MODEL is an optional CSV/JSON of expected final medal counts.
+    SIMULATION_SAMPLES = 2000
+    SIMULATION_WORKERS = None  # processes; None = one per CPU
+    # The admin Re-run button simulates inside the request: fewer samples, one process
+    SIMULATION_REQUEST_SAMPLES = 500
+    SIMULATION_MODEL = os.environ.get('SIMULATION_MODEL')
+    
+    # Players listed per page on /users
+    USERS_PER_PAGE = 100
+    
+    # Per-request SQL/render timing, Server-Timing header and /admin/profiling
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILING_SLOWEST_REQUESTS = 20
+    
     # App settings
     APP_NAME = "2026 Milano-Cortina Winter Olympics Pool"
     APP_SHORT_NAME = "Olympics Pool"
@@ -96,6 +140,24 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     SECRET_KEY = os.environ.get('SECRET_KEY')  # Must be set in production
+    GAME_STATE_CACHE_TTL = 2
+    
+    # WAL lets gunicorn workers keep reading while a medal update commits;
+    # busy_timeout makes writers wait instead of failing with "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,         # milliseconds
+        'synchronous': 'NORMAL',      # durable in WAL mode, far fewer fsyncs
+        'cache_size': -64000,         # ~64 MB page cache per connection
+        'mmap_size': 268435456,       # 256 MB memory-mapped reads
+        'temp_store': 'MEMORY',
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+        'connect_args': {'timeout': 5, 'check_same_thread': False},
+    }
 
 
 class TestingConfig(Config):
@@ -0,0 +1,155 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Exports
+===================================================
+Stream the pool out as CSV or newline-delimited JSON.
+
+Records come from iter_rosters(), which reads the database in batches, and
+are encoded one at a time, so an export of any size is never held in
+memory. Used by `flask export` and the admin download links.
+
+Exports:
+    rosters  One record per registered user: rank, points, tiebreaker and
+             picks (empty for users who have not picked yet)
+    picks    One record per pick, with the player's rank and totals
+
+CSV cells starting with =, +, - or @ are prefixed with ' so spreadsheets
+treat user-entered names as text, not formulas.
+"""
+
+import csv
+import io
+import json
+from functools import partial
+
+from config import TIERS
+from models import iter_rosters
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+_PLAYER_FIELDS = ['user_id', 'username', 'display_name', 'email', 'rank', 'total_points',
+                  'usa_gold_guess', 'usa_silver_guess', 'usa_bronze_guess']
+
+
+def _player_record(roster) -> dict:
+    gold, silver, bronze = roster.tiebreaker or (None, None, None)
+    return {
+        'user_id': roster.user_id,
+        'username': roster.username,
+        'display_name': roster.display_name,
+        'email': roster.email,
+        'rank': roster.rank,
+        'total_points': roster.total_points,
+        'usa_gold_guess': gold,
+        'usa_silver_guess': silver,
+        'usa_bronze_guess': bronze,
+    }
+
+
+def iter_roster_records(flat: bool = False):
+    """
+    One record per registered user, including those without picks.
+
+    Picks are a nested list, or with flat=True one 'tier_N' column per tier
+    holding 'CODE:points' entries separated by '|' (for CSV).
+    """
+    for roster in iter_rosters(include_empty=True):
+        record = _player_record(roster)
+        if flat:
+            for tier in TIERS:
+                record[f'tier_{tier}'] = '|'.join(
+                    f'{pick.code}:{pick.points}' for pick in roster.picks_by_tier.get(tier, [])
+                )
+        else:
+            record['picks'] = [
+                {'tier': pick.tier, 'code': pick.code, 'name': pick.name, 'points': pick.points}
+                for tier in TIERS for pick in roster.picks_by_tier.get(tier, [])
+            ]
+        yield record
+
+
+def iter_pick_records():
+    """One record per pick."""
+    for roster in iter_rosters():
+        player = _player_record(roster)
+        for tier in TIERS:
+            for pick in roster.picks_by_tier.get(tier, []):
+                yield {
+                    **player,
+                    'tier': pick.tier,
+                    'country_code': pick.code,
+                    'country_name': pick.name,
+                    'pick_points': pick.points,
+                }
+
+
+# Record generators per export and format, plus the CSV column order
+EXPORTS = {
+    'rosters': {
+        'csv': partial(iter_roster_records, flat=True),
+        'ndjson': iter_roster_records,
+        'csv_fields': _PLAYER_FIELDS + [f'tier_{tier}' for tier in TIERS],
+    },
+    'picks': {
+        'csv': iter_pick_records,
+        'ndjson': iter_pick_records,
+        'csv_fields': _PLAYER_FIELDS + ['tier', 'country_code', 'country_name', 'pick_points'],
+    },
+}
+
+
+# Leading characters a spreadsheet would evaluate as a formula
+_FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(records, fieldnames, batch_size: int = 500):
+    """Encode records as CSV text chunks, header first."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for count, record in enumerate(records, start=1):
+        writer.writerow({key: _csv_safe(value) for key, value in record.items()})
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(records, batch_size: int = 500):
+    """Encode records as newline-delimited JSON text chunks."""
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, separators=(',', ':')))
+        if len(lines) >= batch_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def iter_export(name: str, fmt: str):
+    """
+    Text chunks for an export.
+
+    Raises:
+        ValueError: For an unknown export or format
+    """
+    if name not in EXPORTS:
+        raise ValueError(f"Unknown export: {name}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    export = EXPORTS[name]
+    records = export[fmt]()
+    if fmt == 'csv':
+        return iter_csv(records, export['csv_fields'])
+    return iter_ndjson(records)
@@ -0,0 +1,73 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Fragment Cache
+==========================================================
+Process-local LRU cache for rendered HTML fragments.
+
+Fragments are keyed by the game-state version, so a score change simply
+makes old keys unreachable and LRU eviction reclaims them.
+"""
+
+import threading
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Thread-safe LRU cache of rendered strings with a total size cap."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached fragment (marking it recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value: str) -> None:
+        """Store a fragment, evicting least recently used ones over the cap."""
+        cost = len(value.encode('utf-8'))
+        if cost > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.encode('utf-8'))
+            self._entries[key] = value
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.encode('utf-8'))
+
+    def get_or_render(self, key, render) -> str:
+        """Return the cached fragment, rendering and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def highlight_row(html: str, user_id, css_class: str) -> Markup:
+    """
+    Add a CSS class to one user's row of a cached fragment.
+
+    Rows must open with '<tr data-user-id="<id>" class="', which makes the
+    per-viewer highlight a single string replacement instead of a re-render.
+    """
+    if user_id is not None:
+        marker = f'<tr data-user-id="{user_id}" class="'
+        html = html.replace(marker, f'{marker}{css_class} ', 1)
+    return Markup(html)
@@ -4,7 +4,80 @@
 Utility functions for flags and display formatting.
 """
 
-from data.countries import COUNTRIES_BY_TIER, IOC_TO_ISO
+from typing import NamedTuple
+
+from markupsafe import Markup
+
+from data.countries import IOC_TO_ISO, all_country_codes
+
+FLAG_IMG_HEIGHT = '1.5rem'
+
+
+class FlagInfo(NamedTuple):
+    """Everything the templates need to draw one country's flag."""
+    iso: str            # Lowercase ISO 3166-1 alpha-2 code, e.g. 'us'
+    emoji: str          # Regional-indicator flag emoji, e.g. 🇺🇸
+    css_class: str      # flag-icons class, e.g. 'fi fi-us'
+    url: str            # flagcdn.com image URL (80px wide)
+    img: Markup         # <img> tag at the default height
+
+
+NO_FLAG = FlagInfo('', '', '', '', Markup(''))
+
+
+def _flag_img(ioc_code: str, iso_code: str, height: str = FLAG_IMG_HEIGHT) -> Markup:
+    return Markup(
+        f'<img src="https://flagcdn.com/w80/{iso_code}.png" alt="{ioc_code}" '
+        f'style="height: {height}; width: auto; border-radius: 2px; '
+        f'box-shadow: 0 1px 3px rgba(0,0,0,0.2); vertical-align: middle;">'
+    )
+
+
+def _build_flag_info(ioc_code: str, iso_code: str) -> FlagInfo:
+    # Flag emoji are two regional indicator symbols, e.g. U + S -> 🇺🇸
+    emoji = ''.join(chr(0x1F1E6 + ord(char) - ord('A')) for char in iso_code.upper())
+    return FlagInfo(
+        iso=iso_code,
+        emoji=emoji,
+        css_class=f'fi fi-{iso_code}',
+        url=f'https://flagcdn.com/w80/{iso_code}.png',
+        img=_flag_img(ioc_code, iso_code),
+    )
+
+
+# Built once at import; filters are dictionary hits from then on
+FLAGS = {ioc: _build_flag_info(ioc, iso) for ioc, iso in IOC_TO_ISO.items()}
+
+
+def report_unknown_flag_codes(codes=None) -> list[str]:
+    """
+    Warn once about country codes without an ISO mapping (no flag shown).
+
+    Args:
+        codes: IOC codes to check (default: every selectable country)
+
+    Returns:
+        The unknown codes
+    """
+    unknown = sorted(code for code in (codes or all_country_codes()) if code.upper() not in FLAGS)
+    for code in unknown:
+        print(f"WARNING: Unknown IOC code '{code}' - no ISO mapping found")
+    return unknown
+
+
+def get_flag_info(ioc_code: str) -> FlagInfo:
+    """
+    Precomputed flag data for an IOC code (any case).
+
+    Returns NO_FLAG for empty or unknown codes; unknown codes are reported
+    by report_unknown_flag_codes() at startup rather than on every render.
+    """
+    if not ioc_code:
+        return NO_FLAG
+    info = FLAGS.get(ioc_code)
+    if info is None:
+        info = FLAGS.get(ioc_code.upper(), NO_FLAG)
+    return info
 
 
 def get_iso_code(ioc_code: str) -> str:
@@ -18,52 +91,22 @@ def get_iso_code(ioc_code: str) -> str:
         ioc_code: Three-letter IOC country code (e.g., 'USA', 'GER', 'SUI')
 
     Returns:
-        Two-letter ISO code (lowercase) for flag services
+        Two-letter ISO code (lowercase) for flag services, or '' if unknown
     """
-    if not ioc_code:
-        return ''
-    
-    ioc_upper = ioc_code.upper()
-    
-    # Look up in the complete mapping
-    if ioc_upper in IOC_TO_ISO:
-        return IOC_TO_ISO[ioc_upper]
-    
-    # Fallback: log warning and return empty (better than wrong flag)
-    print(f"WARNING: Unknown IOC code '{ioc_code}' - no ISO mapping found")
-    return ''
+    return get_flag_info(ioc_code).iso
 
 
 def ioc_to_flag_emoji(ioc_code: str) -> str:
     """
     Convert IOC country code to flag emoji.
 
-    Flag emoji are created by combining regional indicator symbols.
-    For example: US -> 🇺🇸
-
     Args:
         ioc_code: Three-letter IOC country code (e.g., 'USA', 'NOR')
 
     Returns:
         Flag emoji string, or empty string if not found
     """
-    if not ioc_code:
-        return ''
-
-    # Get the correct ISO code first
-    iso_code = get_iso_code(ioc_code)
-    
-    if not iso_code:
-        return ''
-
-    try:
-        flag = ''
-        for char in iso_code.upper():
-            code_point = 0x1F1E6 + ord(char) - ord('A')
-            flag += chr(code_point)
-        return flag
-    except (ValueError, TypeError):
-        return ''
+    return get_flag_info(ioc_code).emoji
 
 
 def get_flag_class(ioc_code: str) -> str:
@@ -76,10 +119,7 @@ def get_flag_class(ioc_code: str) -> str:
     Returns:
         CSS class string for flag-icons (e.g., 'fi fi-us')
     """
-    iso_code = get_iso_code(ioc_code)
-    if not iso_code:
-        return ''
-    return f'fi fi-{iso_code}'
+    return get_flag_info(ioc_code).css_class
 
 
 def get_flag_url(ioc_code: str, width: int = 80) -> str:
@@ -93,16 +133,16 @@ def get_flag_url(ioc_code: str, width: int = 80) -> str:
     Returns:
         URL to flag image, or empty string if mapping not found
     """
-    iso_code = get_iso_code(ioc_code)
-    if not iso_code:
-        return ''
-    return f'https://flagcdn.com/w{width}/{iso_code}.png'
+    info = get_flag_info(ioc_code)
+    if width == 80 or not info.iso:
+        return info.url
+    return f'https://flagcdn.com/w{width}/{info.iso}.png'
 
 
 def register_template_helpers(app):
     """Register Jinja2 template filters and globals."""
 
-    from markupsafe import Markup
+    report_unknown_flag_codes()
 
     @app.template_filter('flag')
     def flag_filter(ioc_code):
@@ -110,12 +150,12 @@ def register_template_helpers(app):
         Jinja2 filter to convert IOC code to flag emoji.
         Usage: {{ 'USA'|flag }} -> 🇺🇸
         """
-        return ioc_to_flag_emoji(ioc_code)
+        return get_flag_info(ioc_code).emoji
 
     @app.template_filter('flag_class')
     def flag_class_filter(ioc_code):
         """Jinja2 filter to get flag-icons CSS class."""
-        return get_flag_class(ioc_code)
+        return get_flag_info(ioc_code).css_class
 
     @app.template_filter('iso')
     def iso_code_filter(ioc_code):
@@ -123,26 +163,20 @@ def register_template_helpers(app):
         Convert IOC code to ISO 3166-1 alpha-2 code for flag assets.
         Usage: {{ 'GER'|iso }} -> 'de'
         """
-        return get_iso_code(ioc_code)
+        return get_flag_info(ioc_code).iso
 
     @app.template_filter('flag_img')
-    def flag_img_filter(ioc_code, height='1.5rem'):
+    def flag_img_filter(ioc_code, height=FLAG_IMG_HEIGHT):
         """
         Jinja2 filter to generate a complete flag <img> tag.
         Usage: {{ 'USA'|flag_img }} or {{ 'USA'|flag_img('2rem') }}
         
         Returns an img tag with the country flag, or empty string if not found.
         """
-        iso_code = get_iso_code(ioc_code)
-        if not iso_code:
-            return ''
-        
-        url = f'https://flagcdn.com/w80/{iso_code}.png'
-        return Markup(
-            f'<img src="{url}" alt="{ioc_code}" '
-            f'style="height: {height}; width: auto; border-radius: 2px; '
-            f'box-shadow: 0 1px 3px rgba(0,0,0,0.2); vertical-align: middle;">'
-        )
+        info = get_flag_info(ioc_code)
+        if height == FLAG_IMG_HEIGHT or not info.iso:
+            return info.img
+        return _flag_img(ioc_code, info.iso, height)
 
     @app.template_filter('medal_count')
     def medal_count_filter(country):
@@ -160,11 +194,11 @@ def register_template_helpers(app):
     @app.template_global()
     def medal_points(country):
         """
-        Get total medal points for a country.
+        Get total medal points for a country (the stored points column).
         """
         if not country:
             return 0
-        return country.calculate_points()
+        return country.points
 
     @app.template_global()
     def medal_breakdown(country):
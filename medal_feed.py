@@ -0,0 +1,161 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Medal Feed Poller
+=============================================================
+Poll an external medal-table JSON feed and apply only what changed.
+
+Requests are conditional (ETag / Last-Modified), so a 304 costs one HTTP
+round trip and no database work. A 200 whose body is byte-identical to the
+last applied payload is also skipped before touching the database.
+"""
+
+import hashlib
+import time
+
+import requests
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from medal_updates import parse_medal_table, apply_medal_table
+from models import db, refresh_scores_at_lock
+
+# Poll outcomes
+NOT_MODIFIED = 'not_modified'   # Feed answered 304
+UNCHANGED = 'unchanged'         # Same body as the last poll
+NO_CHANGES = 'no_changes'       # New body, but counts match the database
+APPLIED = 'applied'             # Medal counts updated and pool rescored
+ERROR = 'error'                 # Fetch, parse or validation failure
+
+
+class MedalFeedPoller:
+    """Conditional-GET poller for a medal-table JSON feed."""
+
+    def __init__(self, url: str, timeout: float = 10, allow_decrease: bool = False,
+                 http=None, on_update=None):
+        self.url = url
+        self.timeout = timeout
+        self.allow_decrease = allow_decrease
+        self.http = http or requests.Session()
+        # Called by run() after scores change, e.g. to refresh the simulation
+        self.on_update = on_update
+
+        # Validators from the last response that was applied (or matched)
+        self.etag = None
+        self.last_modified = None
+        self.last_digest = None
+
+    def fetch(self):
+        """
+        Fetch the feed, sending validators from the last applied response.
+
+        Returns:
+            (body, etag, last_modified) for a 200, or None when the server
+            answered 304. The validators are only stored by poll_once() once
+            the body has been applied, so a rejected batch is fetched again.
+        """
+        headers = {'Accept': 'application/json'}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        response = self.http.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        return (
+            response.content,
+            response.headers.get('ETag', self.etag),
+            response.headers.get('Last-Modified', self.last_modified),
+        )
+
+    def poll_once(self) -> tuple[str, list[str]]:
+        """
+        Run one poll cycle.
+
+        Returns:
+            (outcome, details) where details lists changed country codes for
+            APPLIED and error messages for ERROR.
+        """
+        try:
+            fetched = self.fetch()
+        except requests.RequestException as exc:
+            return ERROR, [f"Fetch failed: {exc}"]
+        if fetched is None:
+            return NOT_MODIFIED, []
+        body, etag, last_modified = fetched
+
+        digest = hashlib.sha256(body).hexdigest()
+        if digest == self.last_digest:
+            self.etag, self.last_modified = etag, last_modified
+            return UNCHANGED, []
+
+        try:
+            rows = parse_medal_table(body.decode('utf-8-sig'), 'json')
+            changed, errors = apply_medal_table(
+                rows,
+                source='feed',
+                allow_decrease=self.allow_decrease,
+                ignore_unknown=True,
+            )
+        except ValueError as exc:
+            return ERROR, [str(exc)]
+        except SQLAlchemyError as exc:
+            # e.g. "database is locked"; retried on the next poll
+            db.session.rollback()
+            return ERROR, [f"Database error: {exc}"]
+        finally:
+            # End the transaction so the next poll sees fresh rows
+            db.session.remove()
+
+        if errors:
+            return ERROR, errors
+
+        self.last_digest = digest
+        self.etag, self.last_modified = etag, last_modified
+        return (APPLIED if changed else NO_CHANGES), changed
+
+    def run(self, interval: float, max_polls: int = None, report=print) -> None:
+        """
+        Poll every interval seconds until interrupted (or max_polls).
+
+        The first poll after the pick deadline also rescores the pool and
+        rebuilds the leaderboard (refresh_scores_at_lock). on_update runs
+        after that and after every applied update.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            updated = False
+            try:
+                if refresh_scores_at_lock() is not None:
+                    report("Picks locked: scores and leaderboard rebuilt")
+                    updated = True
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                report(f"Leaderboard rebuild failed: {exc}")
+            finally:
+                db.session.remove()
+
+            outcome, details = self.poll_once()
+            polls += 1
+
+            if outcome == APPLIED:
+                report(f"Applied feed update for {len(details)} countries: {', '.join(details)}")
+                updated = True
+            elif outcome == ERROR:
+                for msg in details:
+                    report(f"Feed error: {msg}")
+
+            if updated and self.on_update is not None:
+                try:
+                    self.on_update()
+                except SQLAlchemyError as exc:
+                    db.session.rollback()
+                    report(f"Update hook failed: {exc}")
+                finally:
+                    db.session.remove()
+
+            if max_polls is not None and polls >= max_polls:
+                break
+            time.sleep(max(interval - (time.monotonic() - started), 0))
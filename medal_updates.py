@@ -0,0 +1,183 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Batch Medal Updates
+===============================================================
+Parse, validate and apply a whole medal table at once.
+
+A batch is a list of {'code', 'gold', 'silver', 'bronze'} rows. Applying it
+writes all audit rows in one bulk insert, updates only the countries whose
+counts changed and rescores the pool exactly once, in a single transaction.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import insert, update
+
+from models import (
+    db, Country, GameState, MedalAudit,
+    calculate_all_scores, refresh_leaderboard_snapshot, publish_score_event,
+)
+
+MEDAL_FIELDS = ('gold', 'silver', 'bronze')
+
+
+def parse_medal_table(payload: str, fmt: str) -> list[dict]:
+    """
+    Parse a CSV or JSON medal table into batch rows.
+
+    CSV needs a header with code,gold,silver,bronze columns. JSON may be a
+    list of rows or an object with a 'medals' list (the /api/medals shape).
+
+    Raises:
+        ValueError: If the payload cannot be parsed
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(payload))
+        missing = {'code', *MEDAL_FIELDS} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+        return [dict(row) for row in reader]
+
+    if fmt == 'json':
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        if isinstance(data, dict):
+            data = data.get('medals')
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ValueError("JSON must be a list of medal rows or an object with a 'medals' list.")
+        return data
+
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def validate_medal_table(rows: list[dict], allow_decrease: bool = False,
+                         ignore_unknown: bool = False) -> tuple[list[tuple], list[str]]:
+    """
+    Validate a batch against the countries table.
+
+    With ignore_unknown, rows for countries outside the pool (e.g. excluded
+    nations in an official feed) are skipped instead of rejected.
+
+    Returns:
+        (changes, errors) where changes is a list of
+        (country, (gold, silver, bronze)) for countries whose counts differ
+    """
+    errors = []
+    countries = {country.code: country for country in Country.query.all()}
+    seen = set()
+    changes = []
+
+    for line, row in enumerate(rows, start=1):
+        code = str(row.get('code') or '').strip().upper()
+        if not code:
+            errors.append(f"Row {line}: missing country code.")
+            continue
+        if code in seen:
+            errors.append(f"Row {line}: {code} appears more than once.")
+            continue
+        seen.add(code)
+
+        country = countries.get(code)
+        if country is None:
+            if not ignore_unknown:
+                errors.append(f"Row {line}: unknown country code {code}.")
+            continue
+
+        counts = []
+        for field in MEDAL_FIELDS:
+            try:
+                value = int(row.get(field))
+            except (TypeError, ValueError):
+                errors.append(f"Row {line}: {field} for {code} must be a whole number.")
+                break
+            if value < 0:
+                errors.append(f"Row {line}: {field} for {code} must be zero or greater.")
+                break
+            counts.append(value)
+        else:
+            counts = tuple(counts)
+            current = (country.gold_count, country.silver_count, country.bronze_count)
+            if counts == current:
+                continue
+            if not allow_decrease and any(new < old for new, old in zip(counts, current)):
+                errors.append(
+                    f"Row {line}: medal counts for {code} cannot decrease unless corrections are allowed."
+                )
+                continue
+            changes.append((country, counts))
+
+    return changes, errors
+
+
+def apply_medal_table(rows: list[dict], source: str, updated_by=None,
+                      allow_decrease: bool = False, dry_run: bool = False,
+                      ignore_unknown: bool = False) -> tuple[list[str], list[str]]:
+    """
+    Validate and apply a batch of medal counts in one transaction.
+
+    Nothing is written if any row is invalid. When at least one country
+    changed, audit rows are bulk inserted, changed countries updated, and the
+    pool rescored once with the leaderboard snapshot refreshed.
+
+    Returns:
+        (changed_country_codes, errors)
+    """
+    changes, errors = validate_medal_table(
+        rows, allow_decrease=allow_decrease, ignore_unknown=ignore_unknown,
+    )
+    if errors:
+        return [], errors
+    changed_codes = [country.code for country, _ in changes]
+    if not changes or dry_run:
+        return changed_codes, []
+
+    now = datetime.utcnow()
+    updated_by_id = updated_by.id if updated_by is not None else None
+
+    try:
+        db.session.execute(insert(MedalAudit), [
+            {
+                'country_id': country.id,
+                'updated_by_user_id': updated_by_id,
+                'source': source,
+                'gold_before': country.gold_count,
+                'silver_before': country.silver_count,
+                'bronze_before': country.bronze_count,
+                'gold_after': gold,
+                'silver_after': silver,
+                'bronze_after': bronze,
+                'created_at': now,
+            }
+            for country, (gold, silver, bronze) in changes
+        ])
+        db.session.execute(update(Country), [
+            {
+                'id': country.id,
+                'gold_count': gold,
+                'silver_count': silver,
+                'bronze_count': bronze,
+                'updated_at': now,
+            }
+            for country, (gold, silver, bronze) in changes
+        ])
+
+        calculate_all_scores(commit_session=False)
+        refresh = refresh_leaderboard_snapshot(commit_session=False)
+        publish_score_event('medals', refresh, countries=[
+            {'code': code, 'gold': gold, 'silver': silver, 'bronze': bronze}
+            for code, (_, (gold, silver, bronze)) in zip(changed_codes, changes)
+        ])
+
+        game_state = GameState.get_instance()
+        game_state.medals_updated_at = now
+        game_state.scores_calculated_at = now
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return changed_codes, []
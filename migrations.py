@@ -0,0 +1,243 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Schema Migrations
+=============================================================
+Versioned schema changes, applied in order and recorded in schema_migrations.
+
+upgrade_database() runs at startup and from `flask upgrade-db`, so a fresh
+database gets the full schema and an existing olympics_pool.db is upgraded
+in place. The first migration creates any missing tables from the current
+models, so every later one must also be a no-op on a database that is
+already at the latest schema (check before adding a column or index).
+Tables added after the first release still get their own migration, so the
+upgrade path does not depend on what create_tables happens to create today.
+
+The generated country columns embed MEDAL_POINTS and the tier multipliers,
+so upgrade_database() also rebuilds them whenever config.py changes.
+
+Adding a schema change:
+    1. Change the model in models.py
+    2. Append a migration below with the next version number (new tables
+       included: create them with checkfirst=True)
+"""
+
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+
+from models import (
+    db, Country, LeaderboardSnapshot, MedalAudit, Pick, ScoreEvent, ScoreHistory, ScoreVersion,
+    SimulationRun, install_pick_constraints, leaderboard_select,
+    COUNTRY_TOTAL_MEDALS_SQL, COUNTRY_POINTS_SQL,
+)
+
+# Kept out of db.metadata so create_all() never touches it
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable
+
+
+def _columns(conn, table: str) -> set[str]:
+    # table_xinfo also lists generated columns
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_xinfo({table})"))}
+
+
+def _create_tables(conn):
+    db.metadata.create_all(bind=conn)
+
+
+def _game_state_versions(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    columns = _columns(conn, 'game_state')
+    for name in ('version', 'catalog_version'):
+        if name not in columns:
+            conn.execute(text(
+                f"ALTER TABLE game_state ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"
+            ))
+
+
+# Generated country columns; the points weights come from config.py
+COUNTRY_GENERATED_COLUMNS = {
+    'total_medals': COUNTRY_TOTAL_MEDALS_SQL,
+    'points': COUNTRY_POINTS_SQL,
+}
+
+
+def _add_generated_column(conn, name: str, expression: str):
+    # SQLite can only add VIRTUAL generated columns, which is what
+    # create_all() makes too
+    conn.execute(text(
+        f"ALTER TABLE countries ADD COLUMN {name} INTEGER "
+        f"GENERATED ALWAYS AS ({expression}) VIRTUAL"
+    ))
+
+
+def _country_generated_columns(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    columns = _columns(conn, 'countries')
+    for name, expression in COUNTRY_GENERATED_COLUMNS.items():
+        if name not in columns:
+            _add_generated_column(conn, name, expression)
+    for index in Country.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def sync_country_generated_columns(conn) -> list[str]:
+    """
+    Rebuild generated country columns whose stored expression no longer
+    matches models.py, e.g. after MEDAL_POINTS or a tier multiplier changed.
+
+    Otherwise the points column (used by the sql engine and the medal table)
+    would silently disagree with Country.calculate_points(). SQLite cannot
+    alter a generated column, so it is dropped and re-added with its indexes.
+
+    Returns:
+        Names of the rebuilt columns
+    """
+    if conn.dialect.name != 'sqlite':
+        return []
+    schema = conn.scalar(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'countries'"
+    )) or ''
+    stale = [
+        name for name, expression in COUNTRY_GENERATED_COLUMNS.items()
+        if f"{name} INTEGER GENERATED ALWAYS AS ({expression})" not in schema
+    ]
+    for name in stale:
+        indexes = [index for index in Country.__table__.indexes if name in index.columns]
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+        if name in _columns(conn, 'countries'):
+            conn.execute(text(f"ALTER TABLE countries DROP COLUMN {name}"))
+        _add_generated_column(conn, name, COUNTRY_GENERATED_COLUMNS[name])
+        for index in indexes:
+            index.create(conn)
+    return stale
+
+
+def _pick_limit_triggers(conn):
+    install_pick_constraints(conn)
+
+
+def _access_pattern_indexes(conn):
+    for table in (Pick.__table__, MedalAudit.__table__):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _score_history(conn):
+    ScoreVersion.__table__.create(conn, checkfirst=True)
+    ScoreHistory.__table__.create(conn, checkfirst=True)
+
+
+def _simulation_runs(conn):
+    SimulationRun.__table__.create(conn, checkfirst=True)
+
+
+def _leaderboard_snapshot(conn):
+    # Built once here rather than on the first page view, so workers never
+    # race to write it; refresh_leaderboard_snapshot() keeps it current
+    snapshot = LeaderboardSnapshot.__table__
+    snapshot.create(conn, checkfirst=True)
+    if conn.scalar(select(snapshot.c.user_id).limit(1)) is not None:
+        return
+
+    countries = Country.__table__
+    usa = conn.execute(
+        select(countries.c.gold_count, countries.c.silver_count, countries.c.bronze_count)
+        .where(countries.c.code == 'USA')
+    ).first()
+    version = (conn.scalar(select(func.max(ScoreVersion.version))) or 0) + 1
+    standings = leaderboard_select(tuple(usa) if usa else (0, 0, 0)).subquery()
+    inserted = conn.execute(snapshot.insert().from_select(
+        ['user_id', 'points', 'gold_diff', 'silver_diff', 'bronze_diff', 'rank', 'version'],
+        select(
+            standings.c.user_id, standings.c.points,
+            standings.c.gold_diff, standings.c.silver_diff, standings.c.bronze_diff,
+            standings.c.rank, db.literal(version),
+        ),
+    )).rowcount
+    if not inserted:
+        return
+    conn.execute(ScoreVersion.__table__.insert().values(version=version, recorded_at=datetime.utcnow()))
+    conn.execute(ScoreHistory.__table__.insert().from_select(
+        ['user_id', 'version', 'points', 'rank'],
+        select(snapshot.c.user_id, snapshot.c.version, snapshot.c.points, snapshot.c.rank),
+    ))
+
+
+def _score_events(conn):
+    ScoreEvent.__table__.create(conn, checkfirst=True)
+
+
+MIGRATIONS = [
+    Migration(1, 'create_tables', _create_tables),
+    Migration(2, 'game_state_versions', _game_state_versions),
+    Migration(3, 'country_generated_columns', _country_generated_columns),
+    Migration(4, 'pick_limit_triggers', _pick_limit_triggers),
+    Migration(5, 'access_pattern_indexes', _access_pattern_indexes),
+    Migration(6, 'score_history', _score_history),
+    Migration(7, 'simulation_runs', _simulation_runs),
+    Migration(8, 'leaderboard_snapshot', _leaderboard_snapshot),
+    Migration(9, 'score_events', _score_events),
+]
+
+
+def applied_versions(conn) -> set[int]:
+    """Versions recorded in schema_migrations (empty for a new database)."""
+    schema_migrations.create(conn, checkfirst=True)
+    return set(conn.scalars(select(schema_migrations.c.version)))
+
+
+def upgrade_database(engine=None) -> list[Migration]:
+    """
+    Apply every migration not yet recorded, each in its own transaction.
+
+    Args:
+        engine: Engine to upgrade (default db.engine)
+
+    Returns:
+        The migrations that were applied
+    """
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            # Another process may have got here first
+            if migration.version in applied_versions(conn):
+                continue
+            migration.apply(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow(),
+            ))
+        applied.append(migration)
+
+    # Config-derived expressions are checked on every start, not just once
+    with engine.begin() as conn:
+        for name in sync_country_generated_columns(conn):
+            print(f"WARNING: countries.{name} did not match the scoring config; rebuilt it")
+    return applied
+
+
+def migration_status(engine=None) -> list[tuple[Migration, bool]]:
+    """(migration, applied) for every known migration, in order."""
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    return [(migration, migration.version in done) for migration in MIGRATIONS]
@@ -9,14 +9,19 @@ Core Concepts:
 - Tiebreaker based on USA medal guesses
 """
 
-from datetime import datetime
+import json
+import time
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import NamedTuple, Optional
 from zoneinfo import ZoneInfo
 
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from sqlalchemy import event, text
+from sqlalchemy import bindparam, event, inspect, select, text, update
+from sqlalchemy.orm import joinedload
 
 from config import TIERS, MEDAL_POINTS, TIMEZONE, PICK_DEADLINE, TOTAL_PICKS
 
@@ -61,13 +66,26 @@ class User(UserMixin, db.Model):
         """Return display name or username."""
         return self.display_name or self.username
     
+    def roster_status(self) -> tuple[int, bool]:
+        """
+        Return (pick_count, has_tiebreaker) from one grouped query.
+        
+        Memoized until the instance is expired (e.g. on commit), so templates
+        can call is_ready() repeatedly within a request for free.
+        """
+        status = self.__dict__.get('_roster_status')
+        if status is None:
+            status = roster_statuses([self.id]).get(self.id, (0, False))
+            self.__dict__['_roster_status'] = status
+        return status
+    
     def has_complete_picks(self) -> bool:
         """Check if user has submitted all 8 picks."""
-        return self.picks.count() == 8
+        return self.roster_status()[0] == TOTAL_PICKS
     
     def has_tiebreaker(self) -> bool:
         """Check if user has submitted tiebreaker guesses."""
-        return self.tiebreaker is not None
+        return self.roster_status()[1]
     
     def is_ready(self) -> bool:
         """Check if user is fully registered (picks + tiebreaker)."""
@@ -76,7 +94,7 @@ class User(UserMixin, db.Model):
     def get_picks_by_tier(self) -> dict:
         """Return picks organized by tier."""
         result = {tier: [] for tier in TIERS.keys()}
-        for pick in self.picks:
+        for pick in self.picks.options(joinedload(Pick.country)):
             result[pick.country.tier].append(pick)
         return result
     
@@ -92,11 +110,33 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 
+@event.listens_for(User, 'expire')
+def _clear_roster_status(target, attrs):
+    target.__dict__.pop('_roster_status', None)
+
+
+# Generated column expressions for Country. The weights are compiled in as
+# literals, so changing MEDAL_POINTS or a tier multiplier needs a schema change.
+COUNTRY_TOTAL_MEDALS_SQL = 'gold_count + silver_count + bronze_count'
+COUNTRY_POINTS_SQL = (
+    f"(gold_count * {int(MEDAL_POINTS['gold'])}"
+    f" + silver_count * {int(MEDAL_POINTS['silver'])}"
+    f" + bronze_count * {int(MEDAL_POINTS['bronze'])})"
+    " * CASE tier "
+    + ' '.join(f"WHEN {tier} THEN {int(config['multiplier'])}" for tier, config in TIERS.items())
+    + " ELSE 1 END"
+)
+
+
 class Country(db.Model):
     """
     A country that can be selected in the pool.
     """
     __tablename__ = 'countries'
+    __table_args__ = (
+        db.Index('ix_countries_medal_table', 'gold_count', 'silver_count', 'bronze_count'),
+        db.Index('ix_countries_points', 'points'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     code = db.Column(db.String(3), unique=True, nullable=False, index=True)  # IOC code (e.g., 'USA')
@@ -114,6 +154,12 @@ class Country(db.Model):
     silver_count = db.Column(db.Integer, default=0)
     bronze_count = db.Column(db.Integer, default=0)
     
+    # Maintained by the database from the counts above (and tier), so medal
+    # tables can be read in order straight off an index. Only populated once
+    # the row is flushed; use calculate_points() on unsaved objects.
+    total_medals = db.Column(db.Integer, db.Computed(COUNTRY_TOTAL_MEDALS_SQL, persisted=False))
+    points = db.Column(db.Integer, db.Computed(COUNTRY_POINTS_SQL, persisted=False))
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -121,11 +167,6 @@ class Country(db.Model):
     # Relationships
     picks = db.relationship('Pick', backref='country', lazy='dynamic')
     
-    @property
-    def total_medals(self) -> int:
-        """Total medal count."""
-        return self.gold_count + self.silver_count + self.bronze_count
-    
     @property
     def multiplier(self) -> int:
         """Get the scoring multiplier for this country's tier."""
@@ -196,6 +237,10 @@ class Pick(db.Model):
     # Unique constraint: user can only pick a country once
     __table_args__ = (
         db.UniqueConstraint('user_id', 'country_id', name='unique_user_country_pick'),
+        # Pick limit triggers count a user's picks per tier
+        db.Index('ix_picks_user_tier', 'user_id', 'tier'),
+        # Owners of a country (country page, rescore_country)
+        db.Index('ix_picks_country_user', 'country_id', 'user_id'),
     )
     
     def calculate_points(self) -> int:
@@ -266,6 +311,13 @@ class GameState(db.Model):
     # Winner(s) - comma-separated user IDs if co-champions
     winner_ids = db.Column(db.String(100), nullable=True)
     
+    # Bumped whenever any field above changes; lets every worker validate
+    # its cached copy with a single integer read
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Bumped whenever a country's static data changes (see catalog.py)
+    catalog_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     @classmethod
     def get_instance(cls):
         """Get or create the singleton game state."""
@@ -276,14 +328,103 @@ class GameState(db.Model):
             db.session.commit()
         return state
     
+    def snapshot(self) -> 'GameStateSnapshot':
+        """Detached, immutable copy safe to share across requests."""
+        return GameStateSnapshot(
+            medals_updated_at=self.medals_updated_at,
+            scores_calculated_at=self.scores_calculated_at,
+            is_complete=bool(self.is_complete),
+            winner_ids=self.winner_ids,
+            version=self.version or 0,
+            catalog_version=self.catalog_version or 0,
+        )
+    
     def __repr__(self):
         return f'<GameState updated:{self.medals_updated_at} complete:{self.is_complete}>'
 
 
+class GameStateSnapshot(NamedTuple):
+    """Read-only view of GameState held in the process-level cache."""
+
+    medals_updated_at: Optional[datetime]
+    scores_calculated_at: Optional[datetime]
+    is_complete: bool
+    winner_ids: Optional[str]
+    version: int
+    catalog_version: int
+
+
+_VERSIONED_GAME_STATE_FIELDS = ('medals_updated_at', 'scores_calculated_at', 'is_complete', 'winner_ids')
+
+
+@event.listens_for(GameState, 'before_update')
+def _bump_game_state_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _VERSIONED_GAME_STATE_FIELDS):
+        target.version = (target.version or 0) + 1
+        _game_state_cache.clear()
+
+
+_CATALOG_COUNTRY_FIELDS = ('code', 'name', 'tier', 'is_active', 'has_medaled_2010_2022')
+
+
+def _bump_catalog_version(connection):
+    game_state = GameState.__table__
+    connection.execute(update(game_state).values(
+        catalog_version=game_state.c.catalog_version + 1,
+        version=game_state.c.version + 1,
+    ))
+    _game_state_cache.clear()
+
+
+@event.listens_for(Country, 'after_update')
+def _country_catalog_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _CATALOG_COUNTRY_FIELDS):
+        _bump_catalog_version(connection)
+
+
+@event.listens_for(Country, 'after_insert')
+@event.listens_for(Country, 'after_delete')
+def _country_catalog_changed(mapper, connection, target):
+    _bump_catalog_version(connection)
+
+
+# Process-level cache: {'snapshot': GameStateSnapshot, 'checked_at': monotonic seconds}
+_game_state_cache = {}
+
+
+def get_game_state(max_age: float = 0.0) -> GameStateSnapshot:
+    """
+    Return the game state from the process-level cache.
+
+    The cached copy is revalidated by reading only game_state.version, and
+    the full row is reloaded when another worker has bumped it. Within
+    max_age seconds of the last check the cache is trusted without any query.
+    """
+    cached = _game_state_cache.get('snapshot')
+    now = time.monotonic()
+    if cached is not None and now - _game_state_cache['checked_at'] < max_age:
+        return cached
+
+    version = db.session.execute(
+        select(GameState.version).order_by(GameState.id).limit(1)
+    ).scalar()
+    if cached is None or version is None or version != cached.version:
+        cached = GameState.get_instance().snapshot()
+        _game_state_cache['snapshot'] = cached
+    _game_state_cache['checked_at'] = now
+    return cached
+
+
 class MedalAudit(db.Model):
     """Audit log of medal changes for traceability."""
 
     __tablename__ = 'medal_audit'
+    __table_args__ = (
+        # A country's medal history, newest first
+        db.Index('ix_medal_audit_country_created', 'country_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     country_id = db.Column(db.Integer, db.ForeignKey('countries.id'), nullable=False)
@@ -307,6 +448,114 @@ class MedalAudit(db.Model):
         return f'<MedalAudit country={self.country_id} source={self.source}>'
 
 
+class LeaderboardSnapshot(db.Model):
+    """
+    Materialized standings, rebuilt whenever scores change.
+
+    Read routes scan this table by rank instead of re-sorting the pool.
+    """
+
+    __tablename__ = 'leaderboard_snapshot'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    points = db.Column(db.Integer, nullable=False, default=0)
+
+    # Absolute distance from actual USA counts (999 when no tiebreaker)
+    gold_diff = db.Column(db.Integer, nullable=False, default=999)
+    silver_diff = db.Column(db.Integer, nullable=False, default=999)
+    bronze_diff = db.Column(db.Integer, nullable=False, default=999)
+
+    rank = db.Column(db.Integer, nullable=False, index=True)
+
+    # Refresh that last wrote this row (rows that did not move keep theirs)
+    version = db.Column(db.Integer, nullable=False)
+
+    user = db.relationship('User')
+
+    def __repr__(self):
+        return f'<LeaderboardSnapshot #{self.rank} User:{self.user_id} v{self.version}>'
+
+
+class ScoreVersion(db.Model):
+    """When each snapshot version was built (one row per refresh)."""
+
+    __tablename__ = 'score_versions'
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ScoreVersion v{self.version} {self.recorded_at}>'
+
+
+class ScoreHistory(db.Model):
+    """
+    A user's points and rank from a snapshot version onwards.
+
+    Delta-encoded: a row is only written when the user's points or rank
+    changed, so their standing at version v is their latest row at or
+    before v. Keyed (and clustered, WITHOUT ROWID) by user then version, so
+    one user's series and "rank as of v" are both single index ranges.
+    """
+
+    __tablename__ = 'score_history'
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    points = db.Column(db.Integer, nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<ScoreHistory User:{self.user_id} v{self.version} #{self.rank}>'
+
+
+class SimulationRun(db.Model):
+    """
+    Cached win-probability simulation for one score version.
+
+    Results are a JSON list of {user_id, win_probability, expected_rank};
+    a new score version makes the run stale.
+    """
+
+    __tablename__ = 'simulation_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, index=True)
+    samples = db.Column(db.Integer, nullable=False)
+    model = db.Column(db.String(100), nullable=False)
+    duration_ms = db.Column(db.Integer, nullable=False)
+    results = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def rows(self) -> list:
+        return json.loads(self.results)
+
+    def __repr__(self):
+        return f'<SimulationRun v{self.version} {self.samples} samples>'
+
+
+class ScoreEvent(db.Model):
+    """
+    Outbox of score changes pushed to clients over /api/stream.
+
+    Rows are written in the same transaction as the change, so every worker
+    can stream them and clients resume from the last id they saw.
+    """
+
+    __tablename__ = 'score_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # 'medals' or 'scores'
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ScoreEvent {self.id} {self.kind} v{self.version}>'
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -322,13 +571,14 @@ def get_current_time() -> datetime:
     return datetime.now(TIMEZONE)
 
 
-def validate_picks(user_id: int, picks_data: dict) -> tuple[bool, list[str]]:
+def validate_picks(user_id: int, picks_data: dict, catalog=None) -> tuple[bool, list[str]]:
     """
     Validate a set of picks before saving.
     
     Args:
         user_id: The user making the picks
         picks_data: Dict of {tier: [country_ids]}
+        catalog: CountryCatalog to check against (defaults to the cached one)
     
     Returns:
         (is_valid, list_of_error_messages)
@@ -355,9 +605,13 @@ def validate_picks(user_id: int, picks_data: dict) -> tuple[bool, list[str]]:
     if len(all_country_ids) != len(set(all_country_ids)):
         errors.append("Each country can only be selected once.")
     
+    if catalog is None:
+        from catalog import get_country_catalog
+        catalog = get_country_catalog()
+    
     # Verify all countries exist and are active
     for country_id in all_country_ids:
-        country = Country.query.get(country_id)
+        country = catalog.get(country_id)
         if not country:
             errors.append(f"Invalid country ID: {country_id}")
         elif not country.is_active:
@@ -366,61 +620,727 @@ def validate_picks(user_id: int, picks_data: dict) -> tuple[bool, list[str]]:
     # Verify countries are in correct tiers
     for tier, country_ids in picks_data.items():
         for country_id in country_ids:
-            country = Country.query.get(country_id)
+            country = catalog.get(country_id)
             if country and country.tier != tier:
                 errors.append(f"{country.name} is not in Tier {tier}.")
     
     return len(errors) == 0, errors
 
 
-def calculate_all_scores(commit_session: bool = True) -> None:
-    """Recalculate scores for all users."""
+def save_user_picks(user: 'User', picks_data: dict, usa_guess: tuple[int, int, int]) -> bool:
+    """
+    Persist a validated roster and tiebreaker, touching only what changed.
+
+    The stored roster is diffed against the submission: removed picks go in
+    one DELETE, new picks in one batched INSERT (deletes first, so the pick
+    limit triggers never see an over-full roster). If neither picks nor
+    tiebreaker changed, no transaction is opened at all.
+
+    Args:
+        user: The user saving picks
+        picks_data: Dict of {tier: [country_ids]}, already validated
+        usa_guess: (gold, silver, bronze) tiebreaker guess
+
+    Returns:
+        True if anything was written.
+    """
+    picks = Pick.__table__
+    stored = dict(db.session.execute(
+        select(picks.c.country_id, picks.c.tier).where(picks.c.user_id == user.id)
+    ).all())
+    submitted = {
+        country_id: tier
+        for tier, country_ids in picks_data.items()
+        for country_id in country_ids
+    }
+
+    removed = [country_id for country_id, tier in stored.items() if submitted.get(country_id) != tier]
+    added = [
+        {'user_id': user.id, 'country_id': country_id, 'tier': tier}
+        for country_id, tier in submitted.items()
+        if stored.get(country_id) != tier
+    ]
+
+    tiebreaker = user.tiebreaker
+    guess_changed = tiebreaker is None or (
+        tiebreaker.usa_gold, tiebreaker.usa_silver, tiebreaker.usa_bronze
+    ) != tuple(usa_guess)
+
+    if not removed and not added and not guess_changed:
+        return False
+
+    if removed:
+        db.session.execute(
+            picks.delete()
+            .where(picks.c.user_id == user.id)
+            .where(picks.c.country_id.in_(removed))
+        )
+    if added:
+        db.session.execute(picks.insert(), added)
+
+    if guess_changed:
+        usa_gold, usa_silver, usa_bronze = usa_guess
+        if tiebreaker is None:
+            db.session.add(Tiebreaker(
+                user_id=user.id,
+                usa_gold=usa_gold,
+                usa_silver=usa_silver,
+                usa_bronze=usa_bronze,
+            ))
+        else:
+            tiebreaker.usa_gold = usa_gold
+            tiebreaker.usa_silver = usa_silver
+            tiebreaker.usa_bronze = usa_bronze
+
+    db.session.commit()
+    return True
+
+
+def country_points_expression(countries=None):
+    """
+    SQL expression for a country's fantasy points.
+
+    This is the generated points column, so the database can score every
+    row without a round trip through Country.calculate_points().
+    """
+    if countries is None:
+        countries = Country.__table__
+    return countries.c.points
+
+
+def medal_table_select(limit: Optional[int] = None, order: str = 'medals',
+                       active_only: bool = True):
+    """SELECT behind medal_table() (also explained by query_plans.py)."""
+    if order == 'medals':
+        ordering = (Country.gold_count.desc(), Country.silver_count.desc(),
+                    Country.bronze_count.desc())
+    elif order == 'points':
+        ordering = (Country.points.desc(),)
+    else:
+        raise ValueError(f"Unknown medal table order: {order}")
+
+    query = select(Country).where(Country.total_medals > 0)
+    if active_only:
+        query = query.where(Country.is_active == True)
+    return query.order_by(*ordering).limit(limit)
+
+
+def medal_table(limit: Optional[int] = None, order: str = 'medals',
+                active_only: bool = True) -> list['Country']:
+    """
+    Countries with at least one medal, best first.
+
+    Both orders match an index (ix_countries_medal_table or
+    ix_countries_points), so SQLite walks it backwards and stops at limit
+    instead of sorting the whole table.
+
+    Args:
+        limit: Maximum number of countries (default all)
+        order: 'medals' (gold, then silver, then bronze) or 'points'
+        active_only: Skip countries that are no longer participating
+
+    Returns:
+        List of Country objects
+    """
+    return db.session.scalars(medal_table_select(limit, order, active_only)).all()
+
+
+def _calculate_all_scores_orm() -> None:
+    """Object-at-a-time scoring through User/Pick.calculate_points()."""
     users = User.query.all()
     for user in users:
         user.calculate_total_points()
+
+
+def _calculate_all_scores_sql() -> None:
+    """Set-based scoring: one UPDATE for picks, one for user totals."""
+    picks = Pick.__table__
+    users = User.__table__
+    countries = Country.__table__
+
+    db.session.flush()
+    db.session.execute(
+        update(picks).values(points_earned=(
+            select(country_points_expression(countries))
+            .where(countries.c.id == picks.c.country_id)
+            .scalar_subquery()
+        ))
+    )
+    db.session.execute(
+        update(users).values(total_points=db.func.coalesce(
+            select(db.func.sum(picks.c.points_earned))
+            .where(picks.c.user_id == users.c.id)
+            .scalar_subquery(),
+            0,
+        ))
+    )
+    # Loaded User/Pick instances no longer match their rows
+    db.session.expire_all()
+
+
+def _calculate_all_scores_matrix() -> None:
+    """Users x countries matrix-vector product in NumPy (see score_matrix.py)."""
+    from score_matrix import calculate_all_scores_matrix
+    calculate_all_scores_matrix()
+
+
+SCORING_ENGINES = {
+    'orm': _calculate_all_scores_orm,
+    'sql': _calculate_all_scores_sql,
+    'matrix': _calculate_all_scores_matrix,
+}
+
+
+def calculate_all_scores(commit_session: bool = True, engine: str = 'sql') -> None:
+    """
+    Recalculate scores for all users.
+
+    Args:
+        commit_session: Commit once scores are written
+        engine: Key of SCORING_ENGINES; 'orm' is the reference implementation
+    """
+    if engine not in SCORING_ENGINES:
+        raise ValueError(f"Unknown scoring engine: {engine}")
+    SCORING_ENGINES[engine]()
     if commit_session:
         db.session.commit()
 
 
-def get_leaderboard() -> list[dict]:
+def compare_scoring_engines(engine: str, reference: str = 'orm') -> list[str]:
     """
-    Get the current leaderboard with tiebreaker info.
-    Returns list of dicts sorted by points (desc), then tiebreaker.
+    Run two scoring engines over the current session and diff their output.
+
+    Both engines write into the session; the caller decides whether to
+    commit or roll back afterwards.
+
+    Returns:
+        Human-readable mismatch descriptions (empty when identical)
     """
-    users = User.query.filter(User.picks.any()).all()  # Only users with picks
-    
-    # Get USA's actual medal counts
-    usa = Country.query.filter_by(code='USA').first()
-    usa_actual = (usa.gold_count, usa.silver_count, usa.bronze_count) if usa else (0, 0, 0)
-    
-    leaderboard = []
+    def snapshot(name):
+        calculate_all_scores(commit_session=False, engine=name)
+        db.session.flush()
+        totals = dict(db.session.execute(select(User.id, User.total_points)).all())
+        points = dict(db.session.execute(select(Pick.id, Pick.points_earned)).all())
+        return totals, points
+
+    expected_totals, expected_points = snapshot(reference)
+    actual_totals, actual_points = snapshot(engine)
+
+    mismatches = []
+    for user_id, expected in expected_totals.items():
+        if actual_totals.get(user_id) != expected:
+            mismatches.append(
+                f"User {user_id}: {reference}={expected} {engine}={actual_totals.get(user_id)}"
+            )
+    for pick_id, expected in expected_points.items():
+        if actual_points.get(pick_id) != expected:
+            mismatches.append(
+                f"Pick {pick_id}: {reference}={expected} {engine}={actual_points.get(pick_id)}"
+            )
+    return mismatches
+
+
+def medal_points_delta(country: 'Country', previous: tuple[int, int, int]) -> int:
+    """
+    Points a single pick of this country gains (or loses) relative to the
+    medal counts it had before the current edit.
+
+    Args:
+        country: Country whose medal counts were just changed
+        previous: (gold, silver, bronze) counts before the change
+    """
+    gold_before, silver_before, bronze_before = previous
+    multiplier = country.multiplier
+    return (
+        (country.gold_count - gold_before) * MEDAL_POINTS['gold'] * multiplier +
+        (country.silver_count - silver_before) * MEDAL_POINTS['silver'] * multiplier +
+        (country.bronze_count - bronze_before) * MEDAL_POINTS['bronze'] * multiplier
+    )
+
+
+def rescore_country_statements(country_id: int, points: int, delta: int) -> tuple:
+    """
+    The two UPDATEs rescore_country() issues (also explained by query_plans.py):
+    the country's picks, then the totals of the users owning them.
+    """
+    picks = Pick.__table__
+    users = User.__table__
+    return (
+        update(picks)
+        .where(picks.c.country_id == country_id)
+        .values(points_earned=points),
+        update(users)
+        .where(users.c.id.in_(
+            select(picks.c.user_id).where(picks.c.country_id == country_id)
+        ))
+        .values(total_points=db.func.coalesce(users.c.total_points, 0) + delta),
+    )
+
+
+def rescore_country(country: 'Country', previous: tuple[int, int, int],
+                    commit_session: bool = True) -> int:
+    """
+    Apply a single country's medal change to the scores of its owners only.
+
+    Instead of walking every user like calculate_all_scores(), this issues two
+    set-based UPDATEs: one resetting points_earned on the picks of this country
+    and one shifting total_points by the delta for the users owning them.
+
+    Returns:
+        The per-pick point delta that was applied.
+    """
+    delta = medal_points_delta(country, previous)
+    if delta == 0:
+        return 0
+
+    db.session.flush()
+    for statement in rescore_country_statements(country.id, country.calculate_points(), delta):
+        db.session.execute(statement)
+    # Loaded User/Pick instances no longer match their rows
+    db.session.expire_all()
+    if commit_session:
+        db.session.commit()
+    return delta
+
+
+def country_owners_select(country_id: int):
+    """Users who picked a country, in pick order (the country page's list)."""
+    return (
+        select(User)
+        .join(Pick, Pick.user_id == User.id)
+        .where(Pick.country_id == country_id)
+        .order_by(Pick.id)
+    )
+
+
+def user_status_select(users=None):
+    """
+    One row per user with roster completeness, in a single query.
+
+    Each pick count is a correlated COUNT(*) answered by an index seek on
+    ix_picks_user_tier, so the cost follows the users selected, not the size
+    of the picks table. Pass users (e.g. one page of the users table as a
+    subquery) to restrict it.
+
+    Columns: id, username, display_name, created_at, total_points,
+    pick_count, has_tiebreaker, ready
+    """
+    if users is None:
+        users = User.__table__
+    picks = Pick.__table__
+    tiebreakers = Tiebreaker.__table__
+
+    pick_count = (
+        select(db.func.count())
+        .where(picks.c.user_id == users.c.id)
+        .scalar_subquery()
+    )
+    has_tiebreaker = tiebreakers.c.id.is_not(None)
+
+    return (
+        select(
+            users.c.id,
+            users.c.username,
+            db.func.coalesce(db.func.nullif(users.c.display_name, ''), users.c.username).label('display_name'),
+            users.c.created_at,
+            users.c.total_points,
+            pick_count.label('pick_count'),
+            has_tiebreaker.label('has_tiebreaker'),
+            db.and_(pick_count == TOTAL_PICKS, has_tiebreaker).label('ready'),
+        )
+        .select_from(users.outerjoin(tiebreakers, tiebreakers.c.user_id == users.c.id))
+    )
+
+
+def roster_statuses(user_ids=None) -> dict[int, tuple[int, bool]]:
+    """Map user id -> (pick_count, has_tiebreaker) for the given users (or all)."""
+    users = User.__table__
+    if user_ids is not None:
+        users = select(users).where(users.c.id.in_(list(user_ids))).subquery()
+    status = user_status_select(users).subquery()
+    query = select(status.c.id, status.c.pick_count, status.c.has_tiebreaker)
+    return {
+        user_id: (pick_count, bool(has_tiebreaker))
+        for user_id, pick_count, has_tiebreaker in db.session.execute(query)
+    }
+
+
+def prime_roster_status(users) -> None:
+    """Fill the roster_status() memo for many users with one query."""
+    statuses = roster_statuses(user.id for user in users)
     for user in users:
-        entry = {
-            'user': user,
-            'points': user.total_points,
-            'tiebreaker': None,
-            'tiebreaker_diff': (999, 999, 999),  # Default for sorting
-        }
-        
-        if user.tiebreaker:
-            entry['tiebreaker'] = user.tiebreaker
-            entry['tiebreaker_diff'] = user.tiebreaker.get_differences(*usa_actual)
-        
-        leaderboard.append(entry)
-    
-    # Sort: points DESC, then tiebreaker diffs ASC (gold, silver, bronze)
-    leaderboard.sort(key=lambda x: (
-        -x['points'],
-        x['tiebreaker_diff'][0],  # Gold diff
-        x['tiebreaker_diff'][1],  # Silver diff
-        x['tiebreaker_diff'][2],  # Bronze diff
-    ))
-    
-    # Add ranks (handling ties)
-    for i, entry in enumerate(leaderboard):
-        entry['rank'] = i + 1
+        user.__dict__['_roster_status'] = statuses.get(user.id, (0, False))
+
+
+class RosterPick(NamedTuple):
+    country_id: int
+    code: str
+    name: str
+    tier: int
+    points: int
+
+
+class Roster(NamedTuple):
+    user_id: int
+    username: str
+    display_name: str
+    email: str
+    total_points: int
+    rank: Optional[int]
+    tiebreaker: Optional[tuple[int, int, int]]
+    picks_by_tier: dict[int, list[RosterPick]]
+
+
+def iter_rosters(batch_size: int = 1000, include_empty: bool = False):
+    """
+    Yield a Roster for every user with picks (or every user, with
+    include_empty), ordered by username.
+
+    Users, picks, countries, tiebreakers and leaderboard ranks come from one
+    joined query fetched batch_size rows at a time, and rows are grouped per
+    user on the fly, so memory stays flat however large the pool is. Rank is
+    None until the leaderboard snapshot has been built. Pick points are the
+    stored points_earned, so they always add up to total_points even if
+    medals changed since the last rescore.
+    """
+    users = User.__table__
+    picks = Pick.__table__
+    countries = Country.__table__
+    tiebreakers = Tiebreaker.__table__
+    snapshot = LeaderboardSnapshot.__table__
+
+    stmt = (
+        select(
+            users.c.id, users.c.username,
+            db.func.coalesce(db.func.nullif(users.c.display_name, ''), users.c.username),
+            users.c.email, users.c.total_points, snapshot.c.rank,
+            tiebreakers.c.usa_gold, tiebreakers.c.usa_silver, tiebreakers.c.usa_bronze,
+            countries.c.id, countries.c.code, countries.c.name, picks.c.tier,
+            picks.c.points_earned,
+        )
+        .select_from(
+            (users.outerjoin if include_empty else users.join)(picks, picks.c.user_id == users.c.id)
+            .outerjoin(countries, countries.c.id == picks.c.country_id)
+            .outerjoin(tiebreakers, tiebreakers.c.user_id == users.c.id)
+            .outerjoin(snapshot, snapshot.c.user_id == users.c.id)
+        )
+        .order_by(db.func.lower(users.c.username), users.c.id, picks.c.tier, countries.c.name)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for _, rows in groupby(db.session.execute(stmt), key=lambda row: row[0]):
+        rows = list(rows)
+        (user_id, username, display_name, email, total_points, rank,
+         usa_gold, usa_silver, usa_bronze) = rows[0][:9]
+        picks_by_tier = {tier: [] for tier in TIERS}
+        for row in rows:
+            if row[9] is None:  # User without picks (include_empty)
+                continue
+            pick = RosterPick(*row[9:])
+            picks_by_tier.setdefault(pick.tier, []).append(pick)
+        yield Roster(
+            user_id, username, display_name, email, total_points, rank,
+            (usa_gold, usa_silver, usa_bronze) if usa_gold is not None else None,
+            picks_by_tier,
+        )
+
+
+def _usa_actual() -> tuple[int, int, int]:
+    """Actual USA (gold, silver, bronze) counts used by the tiebreaker."""
+    usa = db.session.execute(
+        select(Country.gold_count, Country.silver_count, Country.bronze_count)
+        .where(Country.code == 'USA')
+    ).first()
+    return tuple(usa) if usa else (0, 0, 0)
+
+
+def leaderboard_select(usa_actual: tuple[int, int, int]):
+    """
+    Standings as a single SELECT over users joined to their tiebreakers.
+
+    Only users with picks are included. Tiebreaker distances are computed in
+    SQL (999 when no tiebreaker was submitted) and RANK() assigns competition
+    ranks, so users tied on points and all three distances share a rank.
+
+    Columns: user_id, points, gold_diff, silver_diff, bronze_diff, rank
+    """
+    users = User.__table__
+    tiebreakers = Tiebreaker.__table__
+    picks = Pick.__table__
+    gold, silver, bronze = usa_actual
+
+    points = db.func.coalesce(users.c.total_points, 0)
+    gold_diff = db.func.coalesce(db.func.abs(tiebreakers.c.usa_gold - gold), 999)
+    silver_diff = db.func.coalesce(db.func.abs(tiebreakers.c.usa_silver - silver), 999)
+    bronze_diff = db.func.coalesce(db.func.abs(tiebreakers.c.usa_bronze - bronze), 999)
+
+    return (
+        select(
+            users.c.id.label('user_id'),
+            points.label('points'),
+            gold_diff.label('gold_diff'),
+            silver_diff.label('silver_diff'),
+            bronze_diff.label('bronze_diff'),
+            db.func.rank().over(
+                order_by=(points.desc(), gold_diff, silver_diff, bronze_diff)
+            ).label('rank'),
+        )
+        .select_from(users.outerjoin(tiebreakers, tiebreakers.c.user_id == users.c.id))
+        .where(select(picks.c.id).where(picks.c.user_id == users.c.id).exists())
+    )
 
-    return leaderboard
+
+class LeaderboardRefresh(NamedTuple):
+    """Outcome of a snapshot rebuild."""
+
+    version: int
+    # (user_id, points, rank) for rows that are new or whose points/rank moved
+    changed: list
+
+
+def refresh_leaderboard_snapshot(commit_session: bool = True) -> LeaderboardRefresh:
+    """
+    Bring the leaderboard_snapshot table up to date with current scores.
+
+    Call after anything that changes scores (medal edits, recalculation).
+    The first snapshot is built by the leaderboard_snapshot migration and
+    rebuilt when picks lock (refresh_scores_at_lock).
+
+    Standings are recomputed and diffed against the snapshot in SQL; only
+    rows whose points, rank or tiebreaker distances moved are read back and
+    rewritten, and rows that did not move are left alone. When most rows
+    moved (a medal that reshuffles the whole board) the table is rewritten
+    in one statement instead.
+
+    Returns:
+        The new snapshot version and the rows that changed.
+    """
+    db.session.flush()
+    snapshot = LeaderboardSnapshot.__table__
+    history = ScoreHistory.__table__
+    picks = Pick.__table__
+    # Never reuse a version already in the history, even if the snapshot was emptied
+    version = max(
+        db.session.query(db.func.max(snapshot.c.version)).scalar() or 0,
+        db.session.query(db.func.max(ScoreVersion.version)).scalar() or 0,
+    ) + 1
+
+    standings = leaderboard_select(_usa_actual()).subquery()
+    tiebreaker_moved = db.or_(
+        snapshot.c.gold_diff != standings.c.gold_diff,
+        snapshot.c.silver_diff != standings.c.silver_diff,
+        snapshot.c.bronze_diff != standings.c.bronze_diff,
+    )
+    moved = db.session.execute(
+        select(
+            standings.c.user_id, standings.c.points, standings.c.rank,
+            standings.c.gold_diff, standings.c.silver_diff, standings.c.bronze_diff,
+            snapshot.c.user_id.is_(None).label('is_new'),
+            snapshot.c.points.label('old_points'), snapshot.c.rank.label('old_rank'),
+        )
+        .select_from(standings.outerjoin(snapshot, snapshot.c.user_id == standings.c.user_id))
+        .where(db.or_(
+            snapshot.c.user_id.is_(None),
+            snapshot.c.points != standings.c.points,
+            snapshot.c.rank != standings.c.rank,
+            tiebreaker_moved,
+        ))
+    ).all()
+    changed = [
+        (user_id, points, rank)
+        for user_id, points, rank, _, _, _, is_new, old_points, old_rank in moved
+        if is_new or (old_points, old_rank) != (points, rank)
+    ]
+
+    snapshot_rows = db.session.query(db.func.count()).select_from(snapshot).scalar()
+    if len(moved) * 2 > snapshot_rows:
+        # Most ranks shifted: rewriting the table is cheaper than patching it
+        db.session.execute(snapshot.delete())
+        db.session.execute(snapshot.insert().from_select(
+            ['user_id', 'points', 'rank', 'gold_diff', 'silver_diff', 'bronze_diff', 'version'],
+            select(
+                standings.c.user_id, standings.c.points, standings.c.rank,
+                standings.c.gold_diff, standings.c.silver_diff, standings.c.bronze_diff,
+                db.literal(version),
+            )
+        ))
+    else:
+        # Players whose last pick was removed leave the board
+        db.session.execute(snapshot.delete().where(
+            ~select(picks.c.id).where(picks.c.user_id == snapshot.c.user_id).exists()
+        ))
+        rows = [
+            {
+                'b_user_id': row.user_id, 'points': row.points, 'rank': row.rank,
+                'gold_diff': row.gold_diff, 'silver_diff': row.silver_diff,
+                'bronze_diff': row.bronze_diff, 'version': version,
+            }
+            for row in moved
+        ]
+        updated = [values for values, row in zip(rows, moved) if not row.is_new]
+        added = [values for values, row in zip(rows, moved) if row.is_new]
+        if updated:
+            db.session.execute(
+                snapshot.update().where(snapshot.c.user_id == bindparam('b_user_id')),
+                updated,
+            )
+        if added:
+            db.session.execute(snapshot.insert().values(user_id=bindparam('b_user_id')), added)
+
+    # Score history: only the rows that moved
+    db.session.add(ScoreVersion(version=version))
+    if changed:
+        db.session.execute(history.insert(), [
+            {'user_id': user_id, 'version': version, 'points': points, 'rank': rank}
+            for user_id, points, rank in changed
+        ])
+    if commit_session:
+        db.session.commit()
+    return LeaderboardRefresh(version, changed)
+
+
+def get_leaderboard(limit: Optional[int] = None) -> list:
+    """
+    Get the current leaderboard (or its first limit rows) with tiebreaker info.
+
+    Returns lightweight rows ordered by rank, read from the materialized
+    snapshot: user_id, display_name, points, rank, usa_gold, usa_silver,
+    usa_bronze (None without a tiebreaker), gold_diff, silver_diff, bronze_diff.
+    """
+    snapshot = LeaderboardSnapshot.__table__
+    users = User.__table__
+    tiebreakers = Tiebreaker.__table__
+    query = (
+        select(
+            snapshot.c.user_id,
+            db.func.coalesce(db.func.nullif(users.c.display_name, ''), users.c.username).label('display_name'),
+            snapshot.c.points,
+            snapshot.c.rank,
+            tiebreakers.c.usa_gold,
+            tiebreakers.c.usa_silver,
+            tiebreakers.c.usa_bronze,
+            snapshot.c.gold_diff,
+            snapshot.c.silver_diff,
+            snapshot.c.bronze_diff,
+        )
+        .select_from(
+            snapshot
+            .join(users, users.c.id == snapshot.c.user_id)
+            .outerjoin(tiebreakers, tiebreakers.c.user_id == snapshot.c.user_id)
+        )
+        .order_by(snapshot.c.rank, snapshot.c.user_id)
+        .limit(limit)
+    )
+    return db.session.execute(query).all()
+
+
+def refresh_scores_at_lock() -> Optional[LeaderboardRefresh]:
+    """
+    Rescore and rebuild the leaderboard once picks have locked.
+
+    Rosters can change until the deadline, so a snapshot built before it may
+    be missing players or hold stale totals. Run by `flask lock-picks` and on
+    every medal feed poll; read paths never build the snapshot.
+
+    Returns:
+        The refresh, or None while picks are open or once a snapshot has
+        been built after the deadline.
+    """
+    if not is_picks_locked():
+        return None
+    deadline = PICK_DEADLINE.astimezone(timezone.utc).replace(tzinfo=None)
+    built_at = db.session.scalar(select(db.func.max(ScoreVersion.recorded_at)))
+    if built_at is not None and built_at > deadline:
+        return None
+
+    calculate_all_scores(commit_session=False)
+    refresh = refresh_leaderboard_snapshot(commit_session=False)
+    publish_score_event('scores', refresh)
+    GameState.get_instance().scores_calculated_at = datetime.utcnow()
+    db.session.commit()
+    return refresh
+
+
+def latest_score_version() -> int:
+    """Version of the current leaderboard snapshot (0 before the first)."""
+    return db.session.scalar(select(db.func.max(ScoreVersion.version))) or 0
+
+
+def rank_history(user_id: int) -> list:
+    """
+    A user's points and rank over time.
+
+    Returns one row per version where they changed (version, recorded_at,
+    points, rank), oldest first; each holds until the next row.
+    """
+    history = ScoreHistory.__table__
+    versions = ScoreVersion.__table__
+    return db.session.execute(
+        select(history.c.version, versions.c.recorded_at, history.c.points, history.c.rank)
+        .join(versions, versions.c.version == history.c.version)
+        .where(history.c.user_id == user_id)
+        .order_by(history.c.version)
+    ).all()
+
+
+def biggest_movers(since_version: Optional[int] = None, limit: int = 10) -> list:
+    """
+    Users whose rank changed most between a past version and now.
+
+    Each user's rank at since_version is one index seek into score_history
+    (their latest row at or before it); users with no standing then are
+    skipped.
+
+    Args:
+        since_version: Version to compare against (default the previous one)
+        limit: Maximum number of rows
+
+    Returns:
+        Rows of user_id, display_name, points, rank, previous_points,
+        previous_rank and change (positive = climbed), largest moves first.
+    """
+    snapshot = LeaderboardSnapshot.__table__
+    history = ScoreHistory.__table__
+    users = User.__table__
+
+    if since_version is None:
+        since_version = latest_score_version() - 1
+
+    def as_of(column):
+        return (
+            select(column)
+            .where(history.c.user_id == snapshot.c.user_id, history.c.version <= since_version)
+            .order_by(history.c.version.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    previous_points = as_of(history.c.points)
+    previous_rank = as_of(history.c.rank)
+    change = previous_rank - snapshot.c.rank
+    movers = (
+        select(
+            snapshot.c.user_id,
+            db.func.coalesce(db.func.nullif(users.c.display_name, ''), users.c.username).label('display_name'),
+            snapshot.c.points,
+            snapshot.c.rank,
+            previous_points.label('previous_points'),
+            previous_rank.label('previous_rank'),
+            change.label('change'),
+        )
+        .join(users, users.c.id == snapshot.c.user_id)
+        .subquery()
+    )
+    return db.session.execute(
+        select(movers)
+        .where(movers.c.change != 0)
+        .order_by(db.func.abs(movers.c.change).desc(), movers.c.rank, movers.c.user_id)
+        .limit(limit)
+    ).all()
+
+
+# Roster counts checked by the pick limit triggers (see query_plans.py)
+PICK_TIER_COUNT_SQL = "SELECT COUNT(*) FROM picks WHERE user_id = NEW.user_id AND tier = NEW.tier"
 
 
 def install_pick_constraints(connection=None):
@@ -473,7 +1393,7 @@ def install_pick_constraints(connection=None):
                 BEFORE INSERT ON picks
                 WHEN (
                     NEW.tier = {tier} AND
-                    (SELECT COUNT(*) FROM picks WHERE user_id = NEW.user_id AND tier = NEW.tier) >= {limit}
+                    ({PICK_TIER_COUNT_SQL}) >= {limit}
                 )
                 BEGIN
                     SELECT RAISE(ABORT, 'Tier pick limit exceeded.');
@@ -487,7 +1407,7 @@ def install_pick_constraints(connection=None):
                 BEFORE UPDATE OF tier, user_id ON picks
                 WHEN (
                     NEW.tier = {tier} AND
-                    (SELECT COUNT(*) FROM picks WHERE user_id = NEW.user_id AND tier = NEW.tier AND id != NEW.id) >= {limit}
+                    ({PICK_TIER_COUNT_SQL} AND id != NEW.id) >= {limit}
                 )
                 BEGIN
                     SELECT RAISE(ABORT, 'Tier pick limit exceeded.');
@@ -501,3 +1421,54 @@ def install_pick_constraints(connection=None):
         engine = db.engine
         with engine.begin() as conn:
             _create_triggers(conn)
+
+
+def install_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """
+    Apply PRAGMA settings to every new SQLite connection of an engine.
+
+    Used for the production profile (WAL journal, busy timeout, relaxed
+    fsync, larger page cache and mmap) so concurrent workers can read while
+    a medal update is being written. No-op for other databases.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def publish_score_event(kind: str, refresh: LeaderboardRefresh, countries=(),
+                        max_rows: int = 500, retain: int = 500) -> ScoreEvent:
+    """
+    Queue a score event in the current transaction.
+
+    Carries the new snapshot version, the medal counts of changed countries
+    ({'code', 'gold', 'silver', 'bronze'} dicts) and the leaderboard rows
+    that moved. When more than max_rows moved the
+    rows are omitted and clients are told to reload. Only the newest retain
+    events are kept.
+    """
+    leaderboard = [
+        {'user_id': user_id, 'points': points, 'rank': rank}
+        for user_id, points, rank in refresh.changed
+    ]
+    payload = {
+        'version': refresh.version,
+        'countries': list(countries),
+        'leaderboard': leaderboard if len(leaderboard) <= max_rows else None,
+        'full_refresh': len(leaderboard) > max_rows,
+    }
+    score_event = ScoreEvent(version=refresh.version, kind=kind, payload=json.dumps(payload))
+    db.session.add(score_event)
+    db.session.flush()
+
+    events = ScoreEvent.__table__
+    db.session.execute(events.delete().where(events.c.id <= score_event.id - retain))
+    return score_event
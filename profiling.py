@@ -0,0 +1,194 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Request Profiling
+=============================================================
+Opt-in per-request instrumentation (PROFILING_ENABLED).
+
+Every request records its SQL statement count and time (SQLAlchemy engine
+events), Jinja render time (Flask template signals) and total latency. The
+numbers are returned in a Server-Timing header and aggregated per route in
+process memory for the admin profiling page.
+
+Streamed responses are measured up to the point the response object is
+returned; time spent producing the streamed body is not included.
+"""
+
+import heapq
+import threading
+import time
+from datetime import datetime
+
+from flask import before_render_template, template_rendered, g, has_request_context, request
+from sqlalchemy import event
+
+
+class RouteStats:
+    """Running totals for one route."""
+
+    __slots__ = ('route', 'requests', 'total_ms', 'max_ms', 'sql_count', 'max_sql_count',
+                 'sql_ms', 'render_ms')
+
+    def __init__(self, route: str):
+        self.route = route
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.sql_count = 0
+        self.max_sql_count = 0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+
+    def add(self, total_ms: float, sql_count: int, sql_ms: float, render_ms: float) -> None:
+        self.requests += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.sql_count += sql_count
+        self.max_sql_count = max(self.max_sql_count, sql_count)
+        self.sql_ms += sql_ms
+        self.render_ms += render_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.requests if self.requests else 0.0
+
+    @property
+    def avg_sql_count(self) -> float:
+        return self.sql_count / self.requests if self.requests else 0.0
+
+    @property
+    def avg_sql_ms(self) -> float:
+        return self.sql_ms / self.requests if self.requests else 0.0
+
+    @property
+    def avg_render_ms(self) -> float:
+        return self.render_ms / self.requests if self.requests else 0.0
+
+
+class RequestProfiler:
+    """Collect SQL, render and total timings for every request."""
+
+    def __init__(self, slowest_requests: int = 20):
+        self.slowest_requests = slowest_requests
+        self.enabled = False
+        self.started_at = None
+        self._routes = {}
+        self._slowest = []  # min-heap of (total_ms, seq, details)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, engine) -> None:
+        """Hook into the app's request cycle, template signals and engine."""
+        self.enabled = True
+        self.started_at = datetime.utcnow()
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # -------------------------------------------------------------------------
+    # Per-request measurements
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _current():
+        if has_request_context():
+            return g.get('_profile')
+        return None
+
+    def _before_request(self):
+        g._profile = {
+            'started': time.perf_counter(),
+            'sql_count': 0,
+            'sql_time': 0.0,
+            'render_time': 0.0,
+            'render_stack': [],
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            context._profiling_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._current()
+        started = getattr(context, '_profiling_started', None)
+        if profile is not None and started is not None:
+            profile['sql_count'] += 1
+            profile['sql_time'] += time.perf_counter() - started
+
+    def _before_render(self, sender, template, context, **extra):
+        profile = self._current()
+        if profile is not None:
+            profile['render_stack'].append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        profile = self._current()
+        if profile is not None and profile['render_stack']:
+            started = profile['render_stack'].pop()
+            # Only the outermost render counts; nested ones are inside it
+            if not profile['render_stack']:
+                profile['render_time'] += time.perf_counter() - started
+
+    def _after_request(self, response):
+        profile = g.pop('_profile', None)
+        if profile is None or request.endpoint == 'static':
+            return response
+
+        total_ms = (time.perf_counter() - profile['started']) * 1000
+        sql_ms = profile['sql_time'] * 1000
+        render_ms = profile['render_time'] * 1000
+        sql_count = profile['sql_count']
+
+        response.headers['Server-Timing'] = ', '.join([
+            f'sql;desc="SQL ({sql_count} queries)";dur={sql_ms:.1f}',
+            f'render;desc="Templates";dur={render_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        rule = request.url_rule.rule if request.url_rule else '<unmatched>'
+        self.record(f'{request.method} {rule}', request.full_path.rstrip('?'),
+                    total_ms, sql_count, sql_ms, render_ms)
+        return response
+
+    # -------------------------------------------------------------------------
+    # Aggregates
+    # -------------------------------------------------------------------------
+
+    def record(self, route: str, path: str, total_ms: float, sql_count: int,
+               sql_ms: float, render_ms: float) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats(route)
+            stats.add(total_ms, sql_count, sql_ms, render_ms)
+
+            self._seq += 1
+            entry = (total_ms, self._seq, {
+                'path': path,
+                'total_ms': total_ms,
+                'sql_count': sql_count,
+                'sql_ms': sql_ms,
+                'render_ms': render_ms,
+                'at': datetime.utcnow(),
+            })
+            if len(self._slowest) < self.slowest_requests:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def route_stats(self) -> list[RouteStats]:
+        """Routes ordered by average latency, slowest first."""
+        with self._lock:
+            return sorted(self._routes.values(), key=lambda s: s.avg_ms, reverse=True)
+
+    def slowest(self) -> list[dict]:
+        """The slowest individual requests seen, slowest first."""
+        with self._lock:
+            return [details for _, _, details in sorted(self._slowest, reverse=True)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._slowest.clear()
+            self.started_at = datetime.utcnow()
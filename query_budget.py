@@ -0,0 +1,252 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Query Budgets
+=========================================================
+Count SQL statements and fail when a route or function exceeds its budget.
+
+Budgets are absolute: a page that needs 4 queries for 10 players must still
+need 4 for 100,000. ROUTE_BUDGETS declares one per GET page; run them with
+`flask check-query-budgets` against the current database, or with
+`python -m benchmarks.query_budgets` against synthetic pools of several sizes.
+
+Not budgeted: /api/stream (a long-lived SSE response, off by default),
+/logout (a redirect) and POST-only routes. Routes only served before the
+pick deadline are skipped once picks lock, as are routes answering with a
+status they are expected to give on this database (e.g. /api/simulation's
+503 before the first stored run). Any other non-200 response is reported as
+an error, separately from budget overruns.
+
+Functions can be guarded directly:
+
+    with QueryBudget(2, label='leaderboard'):
+        get_leaderboard()
+
+    @QueryBudget(1)
+    def load_something(): ...
+"""
+
+import contextvars
+from contextlib import ContextDecorator
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event
+
+from models import db, is_picks_locked
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more SQL statements than its budget."""
+
+
+class QueryCounter:
+    """Count SQL statements executed on an engine while active."""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.count = 0
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        if self.engine is None:
+            self.engine = db.engine
+        self.count = 0
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+
+class QueryBudget(ContextDecorator):
+    """Context manager/decorator asserting at most max_queries statements."""
+
+    def __init__(self, max_queries: int, label: str = 'block', engine=None):
+        self.max_queries = max_queries
+        self.label = label
+        self.engine = engine
+        self._counters = []
+
+    def __enter__(self):
+        counter = QueryCounter(self.engine)
+        self._counters.append(counter)
+        return counter.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        counter = self._counters.pop()
+        counter.__exit__(exc_type, exc, tb)
+        if exc_type is None and counter.count > self.max_queries:
+            raise QueryBudgetExceeded(
+                f"{self.label} ran {counter.count} queries (budget {self.max_queries}):\n  "
+                + "\n  ".join(counter.statements)
+            )
+        return False
+
+
+# =============================================================================
+# ROUTE BUDGETS
+# =============================================================================
+
+class RouteBudget(NamedTuple):
+    """
+    Query budget for one GET page.
+
+    path may contain {country_id} and {user_id}, filled in by the checker.
+    viewer is 'anonymous', 'player' (a user with a full roster) or 'admin'.
+    known_issue marks routes that still scale with pool size: they are
+    reported but do not fail the check. picks_open marks routes that
+    redirect once picks lock; they are skipped after the deadline.
+    skip_statuses are responses the route legitimately gives on some
+    databases; they are reported as skipped rather than as errors.
+    """
+    path: str
+    max_queries: int
+    viewer: str = 'anonymous'
+    known_issue: Optional[str] = None
+    picks_open: bool = False
+    skip_statuses: tuple = ()
+
+
+ROUTE_BUDGETS = [
+    RouteBudget('/', 6),
+    RouteBudget('/leaderboard', 5),
+    RouteBudget('/countries', 3),
+    RouteBudget('/country/{country_id}', 3),
+    RouteBudget('/rules', 1),
+    RouteBudget('/medals', 2),
+    RouteBudget('/login', 1),
+    RouteBudget('/register', 1),
+    RouteBudget('/users', 3),
+    RouteBudget('/user/{user_id}', 5),
+    RouteBudget('/api/leaderboard', 2),
+    RouteBudget('/api/medals', 2),
+    RouteBudget('/api/user/{user_id}/history', 3),
+    RouteBudget('/api/movers', 3),
+    # 503 until a simulation has been stored (flask simulate --save)
+    RouteBudget('/api/simulation', 5, skip_statuses=(503,)),
+    RouteBudget('/picks', 5, viewer='player'),
+    RouteBudget('/picks/edit', 7, viewer='player', picks_open=True),
+    RouteBudget('/users', 4, viewer='player'),
+    RouteBudget('/change-password', 2, viewer='player'),
+    RouteBudget('/admin', 5, viewer='admin'),
+    RouteBudget('/admin/users', 4, viewer='admin'),
+    RouteBudget('/admin/medals', 3, viewer='admin'),
+    RouteBudget('/admin/picks', 3, viewer='admin'),
+    RouteBudget('/admin/export/rosters.csv', 2, viewer='admin'),
+    RouteBudget('/admin/export/picks.ndjson', 2, viewer='admin'),
+    RouteBudget('/admin/profiling', 2, viewer='admin'),
+    RouteBudget('/admin/simulation', 6, viewer='admin'),
+]
+
+
+class BudgetResult(NamedTuple):
+    budget: RouteBudget
+    path: str
+    status_code: Optional[int]  # None when not requested (picks locked)
+    queries: int
+
+    @property
+    def skipped(self) -> bool:
+        return self.status_code is None or self.status_code in self.budget.skip_statuses
+
+    @property
+    def passed(self) -> bool:
+        return self.status_code == 200 and self.queries <= self.budget.max_queries
+
+    @property
+    def error(self) -> bool:
+        """An unexpected non-200: a redirect or error page was never measured."""
+        return not self.skipped and self.status_code != 200
+
+    @property
+    def over_budget(self) -> bool:
+        """Measured over budget on a route not marked as a known issue."""
+        return (self.status_code == 200 and self.queries > self.budget.max_queries
+                and self.budget.known_issue is None)
+
+    @property
+    def failed(self) -> bool:
+        return self.error or self.over_budget
+
+
+def _fetch(client, path):
+    response = client.get(path)
+    # Streamed pages only query while their body is produced
+    response.get_data()
+    response.close()
+    return response
+
+
+def check_route_budgets(app, viewers: dict, params: dict,
+                        budgets: list = None) -> list[BudgetResult]:
+    """
+    Request every budgeted route twice (cold and warm caches) and record
+    the larger statement count.
+
+    Args:
+        app: The Flask app
+        viewers: {'player': user_id, 'admin': user_id}; anonymous needs none
+        params: Values for path placeholders, e.g. {'country_id': 1, 'user_id': 2}
+        budgets: RouteBudgets to check (default ROUTE_BUDGETS)
+
+    Returns:
+        One BudgetResult per route
+    """
+    clients = {}
+    for viewer in ('anonymous', 'player', 'admin'):
+        client = app.test_client()
+        if viewer != 'anonymous':
+            with client.session_transaction() as session:
+                session['_user_id'] = str(viewers[viewer])
+                session['_fresh'] = True
+        clients[viewer] = client
+
+    with app.app_context():
+        engine = db.engine
+
+    results = []
+    for budget in budgets or ROUTE_BUDGETS:
+        path = budget.path.format(**params)
+        if budget.picks_open and is_picks_locked():
+            results.append(BudgetResult(budget, path, None, 0))
+            continue
+        client = clients[budget.viewer]
+        worst = 0
+        status_code = None
+        for _ in range(2):
+            with QueryCounter(engine) as counter:
+                # An empty context gives the request its own app context (and
+                # session and g) even when called from inside one, e.g. the CLI
+                response = contextvars.Context().run(_fetch, client, path)
+            worst = max(worst, counter.count)
+            status_code = response.status_code
+        results.append(BudgetResult(budget, path, status_code, worst))
+    return results
+
+
+def format_budget_results(results: list[BudgetResult]) -> list[str]:
+    """Report lines for check_route_budgets() results."""
+    lines = []
+    for result in results:
+        if result.skipped:
+            reason = 'picks locked' if result.status_code is None else f'HTTP {result.status_code}'
+            lines.append(f"{'SKIP':<6}{result.budget.viewer:<10}{result.path:<28}{reason}")
+            continue
+        if result.passed:
+            mark = 'ok'
+        elif result.error:
+            mark = 'ERROR'
+        elif result.budget.known_issue:
+            mark = 'KNOWN'
+        else:
+            mark = 'OVER'
+        line = (f"{mark:<6}{result.budget.viewer:<10}{result.path:<28}"
+                f"{result.queries:>5} / {result.budget.max_queries:<4} HTTP {result.status_code}")
+        if not result.passed and result.budget.known_issue:
+            line += f"  ({result.budget.known_issue})"
+        lines.append(line)
+    return lines
@@ -0,0 +1,118 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Query Plan Checks
+=============================================================
+EXPLAIN QUERY PLAN the hot lookups and confirm each is served by the index
+added for it. Every check builds its statement with the same function the
+app uses (or, for the pick limit triggers, the same SQL), so a dropped index
+or a rewritten query that no longer uses one is caught. Run with
+`flask check-query-plans` (SQLite only).
+"""
+
+from typing import Callable, NamedTuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import with_parent
+
+from models import (
+    db, Country, MedalAudit, PICK_TIER_COUNT_SQL,
+    country_owners_select, medal_table_select, rescore_country_statements,
+)
+
+
+class QueryPlanCheck(NamedTuple):
+    """A statement built as the app builds it, and the index it must use."""
+    label: str
+    statement: Callable
+    index: str
+
+
+def _trigger_statement(sql: str):
+    # NEW.<column> is only defined inside the trigger; bind it instead
+    return text(sql.replace('NEW.', ':'))
+
+
+QUERY_PLAN_CHECKS = [
+    QueryPlanCheck(
+        'pick tier limit trigger',
+        lambda: _trigger_statement(PICK_TIER_COUNT_SQL),
+        'ix_picks_user_tier',
+    ),
+    QueryPlanCheck(
+        'country page owners',
+        lambda: country_owners_select(1),
+        'ix_picks_country_user',
+    ),
+    QueryPlanCheck(
+        'rescore country picks',
+        lambda: rescore_country_statements(1, 0, 0)[0],
+        'ix_picks_country_user',
+    ),
+    QueryPlanCheck(
+        'rescore country owners',
+        lambda: rescore_country_statements(1, 0, 0)[1],
+        'ix_picks_country_user',
+    ),
+    QueryPlanCheck(
+        'country medal audits',
+        # What Country.medal_audits lazy-loads
+        lambda: select(MedalAudit).where(with_parent(Country(id=1), Country.medal_audits)),
+        'ix_medal_audit_country_created',
+    ),
+    QueryPlanCheck(
+        'medal table',
+        lambda: medal_table_select(),
+        'ix_countries_medal_table',
+    ),
+    QueryPlanCheck(
+        'medal leaders',
+        lambda: medal_table_select(limit=5, active_only=False),
+        'ix_countries_medal_table',
+    ),
+    QueryPlanCheck(
+        'most valuable countries',
+        lambda: medal_table_select(limit=5, order='points', active_only=False),
+        'ix_countries_points',
+    ),
+]
+
+
+class QueryPlanResult(NamedTuple):
+    check: QueryPlanCheck
+    sql: str
+    plan: list[str]
+
+    @property
+    def passed(self) -> bool:
+        return any(
+            f'USING INDEX {self.check.index}' in detail
+            or f'USING COVERING INDEX {self.check.index}' in detail
+            for detail in self.plan
+        )
+
+
+def explain(statement) -> tuple[str, list[str]]:
+    """
+    Compile a statement for the current database and EXPLAIN QUERY PLAN it.
+
+    Returns:
+        (compiled SQL, detail column of each plan row)
+    """
+    # render_postcompile expands IN lists, which EXPLAIN cannot bind
+    compiled = statement.compile(dialect=db.engine.dialect,
+                                 compile_kwargs={'render_postcompile': True})
+    sql = str(compiled)
+    params = tuple(compiled.params.get(name) for name in compiled.positiontup or ())
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', params)
+    return sql, [row[3] for row in rows]
+
+
+def check_query_plans(checks: list = None) -> list[QueryPlanResult]:
+    """
+    Explain every check on the current database.
+
+    Statements are built for id 1; plans depend on the indexes, not the values.
+    """
+    results = []
+    for check in checks or QUERY_PLAN_CHECKS:
+        results.append(QueryPlanResult(check, *explain(check.statement())))
+    return results
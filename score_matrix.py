@@ -0,0 +1,171 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Scoring Matrix
+==========================================================
+The pool as a sparse users x countries incidence matrix, scored with NumPy.
+
+A country's points are its medal counts times a weight vector (MEDAL_POINTS
+x its tier multiplier), so every roster total is one matrix-vector product
+of the incidence matrix with the countries' points vector. The same
+matrices score hypothetical medal tables (what-ifs, the win-probability
+simulator) without touching the database.
+
+Used by the 'matrix' scoring engine: two SELECTs, the product, then one
+UPDATE for every pick and one executemany for the users whose total moved.
+
+Needs NumPy (pip install numpy); without it NumpyUnavailable is raised.
+"""
+
+from itertools import chain
+from typing import NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, only needed here
+    np = None
+
+from sqlalchemy import bindparam, case, select, update
+
+from config import MEDAL_POINTS, TIERS
+from medal_updates import MEDAL_FIELDS
+from models import db, Country, Pick, User
+
+
+class NumpyUnavailable(RuntimeError):
+    """Raised when a NumPy-backed feature is used without NumPy installed."""
+
+
+def require_numpy(feature: str = 'The matrix scoring engine') -> None:
+    if np is None:
+        raise NumpyUnavailable(f'{feature} needs NumPy: pip install numpy')
+
+
+class CountryVector(NamedTuple):
+    """Countries ordered by id, with medal counts and point weights."""
+    ids: 'np.ndarray'       # (countries,)
+    codes: list             # (countries,)
+    weights: 'np.ndarray'   # (3, countries) points per gold/silver/bronze
+    counts: 'np.ndarray'    # (3, countries) current medal counts
+
+    def points(self, counts: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """
+        Points per country for counts shaped (3, countries), or a stack of
+        medal tables shaped (samples, 3, countries). Defaults to the current
+        counts.
+        """
+        if counts is None:
+            counts = self.counts
+        return (counts * self.weights).sum(axis=-2)
+
+
+class PickMatrix(NamedTuple):
+    """
+    Sparse users x countries incidence, stored as one (row, col) per pick.
+
+    Only users with at least one pick appear, ordered by id.
+    """
+    user_ids: 'np.ndarray'   # (users,)
+    pick_ids: 'np.ndarray'   # (picks,)
+    rows: 'np.ndarray'       # (picks,) user index of each pick
+    cols: 'np.ndarray'       # (picks,) country index of each pick
+    num_countries: int
+
+    def score(self, country_points: 'np.ndarray') -> 'np.ndarray':
+        """Total per user for a (countries,) points vector."""
+        return np.bincount(self.rows, weights=country_points[self.cols],
+                           minlength=len(self.user_ids))
+
+    def dense(self) -> 'np.ndarray':
+        """Dense (countries, users) incidence for scoring many tables at once."""
+        incidence = np.zeros((self.num_countries, len(self.user_ids)))
+        np.add.at(incidence, (self.cols, self.rows), 1)
+        return incidence
+
+    def score_many(self, country_points: 'np.ndarray') -> 'np.ndarray':
+        """Totals shaped (samples, users) for (samples, countries) points."""
+        return country_points @ self.dense()
+
+
+def load_countries() -> CountryVector:
+    """Every country's counts and weights (one query)."""
+    require_numpy()
+    rows = db.session.execute(
+        select(Country.id, Country.code, Country.tier,
+               Country.gold_count, Country.silver_count, Country.bronze_count)
+        .order_by(Country.id)
+    ).all()
+    multipliers = np.array(
+        [TIERS.get(row.tier, {}).get('multiplier', 1) for row in rows], dtype=np.int64
+    )
+    base = np.array([MEDAL_POINTS[field] for field in MEDAL_FIELDS], dtype=np.int64)
+    counts = np.array(
+        [[row.gold_count or 0, row.silver_count or 0, row.bronze_count or 0] for row in rows],
+        dtype=np.int64,
+    ).reshape(-1, 3).T
+    return CountryVector(
+        ids=np.array([row.id for row in rows], dtype=np.int64),
+        codes=[row.code for row in rows],
+        weights=base[:, None] * multipliers[None, :],
+        counts=counts,
+    )
+
+
+def load_pick_matrix(countries: CountryVector) -> PickMatrix:
+    """Every pick as a matrix entry (one query)."""
+    require_numpy()
+    table = Pick.__table__
+    # Core rows, flattened through fromiter: np.array() probes every Row for the
+    # array protocols, which dominates at 100k+ picks
+    picks = np.fromiter(
+        chain.from_iterable(db.session.connection().execute(
+            select(table.c.id, table.c.user_id, table.c.country_id)
+        )),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    user_ids = np.unique(picks[:, 1])
+    return PickMatrix(
+        user_ids=user_ids,
+        pick_ids=picks[:, 0],
+        rows=np.searchsorted(user_ids, picks[:, 1]),
+        cols=np.searchsorted(countries.ids, picks[:, 2]),
+        num_countries=len(countries.ids),
+    )
+
+
+def calculate_all_scores_matrix() -> None:
+    """
+    Score every pick and user with one matrix-vector product.
+
+    Pick points only depend on the country, so they are written with a single
+    CASE UPDATE; user totals are written only where they changed.
+    """
+    require_numpy()
+    db.session.flush()
+    countries = load_countries()
+    matrix = load_pick_matrix(countries)
+    country_points = countries.points()
+    totals = matrix.score(country_points).astype(np.int64)
+
+    picks = Pick.__table__
+    users = User.__table__
+    if len(countries.ids):
+        db.session.execute(update(picks).values(points_earned=case(
+            dict(zip(countries.ids.tolist(), country_points.tolist())),
+            value=picks.c.country_id,
+            else_=0,
+        )))
+
+    # Users without picks score 0
+    new_totals = dict(zip(matrix.user_ids.tolist(), totals.tolist()))
+    changed = [
+        {'user_id': user_id, 'total': new_totals.get(user_id, 0)}
+        for user_id, current in db.session.connection().execute(select(users.c.id, users.c.total_points))
+        if current != new_totals.get(user_id, 0)
+    ]
+    if changed:
+        db.session.execute(
+            update(users).where(users.c.id == bindparam('user_id'))
+            .values(total_points=bindparam('total')),
+            changed,
+        )
+    # Loaded User/Pick instances no longer match their rows
+    db.session.expire_all()
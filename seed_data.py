@@ -12,6 +12,7 @@ import sys
 from app import app, db
 from data.countries import COUNTRIES_BY_TIER, iter_countries
 from models import Country, GameState
+from catalog import load_country_catalog
 
 
 def seed_countries(reset: bool = False) -> None:
@@ -80,8 +81,12 @@ def list_countries() -> None:
         print("\nAll Countries in Database:")
         print("=" * 60)
 
-        for tier in COUNTRIES_BY_TIER.keys():
-            countries = Country.query.filter_by(tier=tier).order_by(Country.name).all()
+        catalog = load_country_catalog(version=0)
+        by_tier = {tier: [] for tier in COUNTRIES_BY_TIER.keys()}
+        for country in sorted(catalog.by_id.values(), key=lambda c: c.name):
+            by_tier.setdefault(country.tier, []).append(country)
+
+        for tier, countries in by_tier.items():
             print(f"\nTier {tier} ({len(countries)} countries):")
             for c in countries:
                 medal_status = "✅" if c.has_medaled_2010_2022 else "⚪"
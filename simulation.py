@@ -0,0 +1,332 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Win Probability Simulator
+=====================================================================
+Monte Carlo estimate of every player's chance of winning the pool.
+
+Each sample draws the medals still to come for every country from a Poisson
+distribution around an expected-medals model, scores all rosters against the
+resulting final medal table with one matrix product, and ranks the pool the
+way the leaderboard does: points, then distance from the simulated USA
+gold/silver/bronze counts. Samples are split into chunks and fanned out
+across a process pool.
+
+Expected-medals model:
+    By default each medal type's remaining events (MEDAL_EVENTS minus the
+    medals of that type awarded so far) are shared out in proportion to what
+    countries have won already, plus one so nobody is ruled out. A CSV/JSON
+    file of code,gold,silver,bronze expected *final* counts replaces it;
+    countries missing from the file win nothing more.
+
+Needs NumPy (pip install numpy); without it SimulationUnavailable is raised.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+
+from config import MEDAL_EVENTS
+from medal_updates import MEDAL_FIELDS, parse_medal_table
+from models import (
+    db, LeaderboardSnapshot, Tiebreaker, User, SimulationRun, latest_score_version,
+)
+from score_matrix import (
+    np, CountryVector, NumpyUnavailable, PickMatrix, load_countries, load_pick_matrix,
+)
+
+# Tiebreaker distance for a missing guess, as in leaderboard_select()
+NO_GUESS_DIFF = 999
+
+# Samples per task; bounds each worker's (samples x users) matrices
+CHUNK_SIZE = 250
+
+
+class SimulationUnavailable(NumpyUnavailable):
+    """Raised when NumPy is not installed."""
+
+
+def _require_numpy():
+    if np is None:
+        raise SimulationUnavailable('The simulator needs NumPy: pip install numpy')
+
+
+class PoolArrays(NamedTuple):
+    """The pool as arrays; users and countries in a fixed order."""
+    countries: CountryVector
+    matrix: PickMatrix
+    guesses: 'np.ndarray'   # (users, 3) USA guesses, -1 where missing
+    usa: int                # country index of USA, -1 if absent
+
+
+class SimulationResult(NamedTuple):
+    samples: int
+    model: str
+    duration_ms: int
+    # {'user_id', 'win_probability', 'expected_rank'}, most likely winner first
+    rows: list
+
+
+def load_pool() -> PoolArrays:
+    """Read countries, picks and tiebreakers into arrays (three queries)."""
+    _require_numpy()
+    countries = load_countries()
+    matrix = load_pick_matrix(countries)
+
+    user_ids = matrix.user_ids
+    guesses = np.full((len(user_ids), 3), -1, dtype=np.int64)
+    for user_id, *guess in db.session.execute(
+        select(Tiebreaker.user_id, Tiebreaker.usa_gold, Tiebreaker.usa_silver, Tiebreaker.usa_bronze)
+    ):
+        index = np.searchsorted(user_ids, user_id)
+        if index < len(user_ids) and user_ids[index] == user_id:
+            guesses[index] = [-1 if value is None else value for value in guess]
+
+    return PoolArrays(
+        countries=countries,
+        matrix=matrix,
+        guesses=guesses,
+        usa=countries.codes.index('USA') if 'USA' in countries.codes else -1,
+    )
+
+
+def pace_model(current: 'np.ndarray', events: int = MEDAL_EVENTS) -> 'np.ndarray':
+    """Expected final counts: remaining medals shared by medals won so far."""
+    _require_numpy()
+    awarded = current.sum(axis=1, keepdims=True)
+    remaining = np.maximum(events - awarded, 0)
+    share = (current + 1) / (current + 1).sum(axis=1, keepdims=True)
+    return current + remaining * share
+
+
+def load_expected_medals(path: str, pool: PoolArrays) -> 'np.ndarray':
+    """
+    Expected final counts from a CSV/JSON medal table (code,gold,silver,bronze).
+
+    Raises:
+        ValueError: If the file cannot be parsed or names an unknown country
+    """
+    _require_numpy()
+    fmt = 'json' if path.lower().endswith('.json') else 'csv'
+    with open(path, encoding='utf-8-sig') as f:
+        rows = parse_medal_table(f.read(), fmt)
+
+    current = pool.countries.counts
+    index = {code: i for i, code in enumerate(pool.countries.codes)}
+    expected = current.astype(np.float64)
+    for row in rows:
+        code = str(row.get('code') or '').strip().upper()
+        if code not in index:
+            raise ValueError(f"Unknown country code in model: {code or '(blank)'}")
+        for medal, field in enumerate(MEDAL_FIELDS):
+            try:
+                expected[medal, index[code]] = float(row.get(field) or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f"{code}: {field} must be a number") from None
+    # Medals already won cannot be taken away
+    return np.maximum(expected, current)
+
+
+class _Simulation:
+    """Samples chunks of final medal tables for one pool."""
+
+    def __init__(self, pool: PoolArrays, remaining: 'np.ndarray'):
+        self.pool = pool
+        self.remaining = remaining
+        # Dense countries x users incidence: a roster's points are one column
+        self.incidence = pool.matrix.dense()
+
+    def run(self, samples: int, seed) -> tuple:
+        """Return (win shares, sum of ranks) per user over samples draws."""
+        pool = self.pool
+        rng = np.random.default_rng(seed)
+        users = len(pool.matrix.user_ids)
+
+        current = pool.countries.counts
+        final = current + rng.poisson(self.remaining, size=(samples,) + self.remaining.shape)
+        country_points = pool.countries.points(final).astype(np.float64)
+        points = np.rint(country_points @ self.incidence).astype(np.int64)
+
+        # One sortable key: points, then smaller gold/silver/bronze distances
+        key = points * 10**9
+        if pool.usa >= 0:
+            usa_final = final[:, :, pool.usa]
+        else:
+            usa_final = np.zeros((samples, 3), dtype=np.int64)
+        for medal, scale in enumerate((10**6, 10**3, 1)):
+            guess = pool.guesses[:, medal]
+            diff = np.minimum(np.abs(usa_final[:, medal:medal + 1] - guess), NO_GUESS_DIFF)
+            key -= np.where(guess >= 0, diff, NO_GUESS_DIFF) * scale
+
+        # Ties for first split the win
+        winners = key == key.max(axis=1, keepdims=True)
+        wins = (winners / winners.sum(axis=1, keepdims=True)).sum(axis=0)
+
+        # Competition ranks (ties share the best position), as in RANK()
+        order = np.argsort(-key, axis=1)
+        ordered = np.take_along_axis(key, order, axis=1)
+        starts = np.ones(ordered.shape, dtype=bool)
+        starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        positions = np.where(starts, np.arange(users), 0)
+        ranks = np.maximum.accumulate(positions, axis=1) + 1
+        rank_sum = np.bincount(order.ravel(), weights=ranks.ravel(), minlength=users)
+        return wins, rank_sum
+
+
+# Per-process simulation, built once by the pool initializer
+_worker = None
+
+
+def _init_worker(pool: PoolArrays, remaining: 'np.ndarray') -> None:
+    global _worker
+    _worker = _Simulation(pool, remaining)
+
+
+def _run_chunk(samples: int, seed) -> tuple:
+    return _worker.run(samples, seed)
+
+
+def simulate(samples: int = 10000, model_path: Optional[str] = None,
+             workers: Optional[int] = None, seed: Optional[int] = None,
+             pool: Optional[PoolArrays] = None) -> SimulationResult:
+    """
+    Estimate each player's win probability and expected finish.
+
+    Args:
+        samples: Number of simulated final medal tables
+        model_path: CSV/JSON of expected final medal counts (default pace_model)
+        workers: Processes to use (default one per CPU; 1 runs in-process)
+        seed: Random seed for reproducible runs
+        pool: Pre-loaded arrays (default load_pool())
+
+    Returns:
+        SimulationResult with one row per player with picks
+
+    Raises:
+        SimulationUnavailable: If NumPy is not installed
+        ValueError: If the model file is invalid
+    """
+    _require_numpy()
+    started = time.perf_counter()
+    pool = pool or load_pool()
+    if model_path:
+        expected = load_expected_medals(model_path, pool)
+        model = os.path.basename(model_path)
+    else:
+        expected = pace_model(pool.countries.counts)
+        model = 'pace'
+    remaining = np.maximum(expected - pool.countries.counts, 0)
+
+    user_ids = pool.matrix.user_ids
+    users = len(user_ids)
+    wins = np.zeros(users)
+    rank_sum = np.zeros(users)
+    if users and samples > 0:
+        chunks = [min(CHUNK_SIZE, samples - start) for start in range(0, samples, CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers == 1:
+            simulation = _Simulation(pool, remaining)
+            outputs = [simulation.run(size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(pool, remaining)) as executor:
+                outputs = list(executor.map(_run_chunk, chunks, seeds))
+        for chunk_wins, chunk_ranks in outputs:
+            wins += chunk_wins
+            rank_sum += chunk_ranks
+
+    samples = max(samples, 1)
+    win_probability = wins / samples
+    expected_rank = rank_sum / samples
+    rows = [
+        {
+            'user_id': int(user_ids[i]),
+            'win_probability': round(float(win_probability[i]), 4),
+            'expected_rank': round(float(expected_rank[i]), 2),
+        }
+        for i in np.lexsort((expected_rank, -win_probability))
+    ]
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    return SimulationResult(samples, model, duration_ms, rows)
+
+
+def save_simulation(result: SimulationResult, version: Optional[int] = None) -> SimulationRun:
+    """Store a result as the latest run for a score version (default current)."""
+    if version is None:
+        version = latest_score_version()
+    run = SimulationRun(
+        version=version,
+        samples=result.samples,
+        model=result.model,
+        duration_ms=result.duration_ms,
+        results=json.dumps(result.rows, separators=(',', ':')),
+    )
+    db.session.add(run)
+    db.session.flush()
+    # Only the newest run is ever read
+    runs = SimulationRun.__table__
+    db.session.execute(runs.delete().where(runs.c.id < run.id))
+    db.session.commit()
+    return run
+
+
+def latest_simulation_id() -> Optional[int]:
+    """Id of the newest stored run, without loading its results."""
+    return db.session.scalar(select(db.func.max(SimulationRun.id)))
+
+
+def latest_simulation() -> Optional[SimulationRun]:
+    """The newest stored run (possibly for an older score version), or None."""
+    run_id = latest_simulation_id()
+    return db.session.get(SimulationRun, run_id) if run_id is not None else None
+
+
+def refresh_simulation(samples: int, model_path: Optional[str] = None,
+                       workers: Optional[int] = None, force: bool = False) -> Optional[SimulationRun]:
+    """
+    Run and store a simulation unless the newest run already covers the
+    current score version (or force).
+
+    Runs from background jobs (the medal feed poller after each update,
+    `flask simulate --save`) and the admin Re-run button, which caps the
+    samples; other request handlers just read the stored run.
+
+    Returns:
+        The new run, or None if the stored one was current
+    """
+    version = latest_score_version()
+    run = latest_simulation()
+    if run is not None and run.version == version and not force:
+        return None
+    return save_simulation(simulate(samples, model_path, workers), version)
+
+
+def simulation_rows(results: list, limit: Optional[int] = None) -> list[dict]:
+    """
+    Simulation rows (or the first limit) with each player's name and current
+    rank and points, in one query.
+    """
+    rows = [dict(row) for row in results[:limit]]
+    snapshot = LeaderboardSnapshot.__table__
+    users = User.__table__
+    standings = {
+        row.user_id: row
+        for row in db.session.execute(
+            select(
+                users.c.id.label('user_id'),
+                db.func.coalesce(db.func.nullif(users.c.display_name, ''), users.c.username).label('name'),
+                snapshot.c.rank, snapshot.c.points,
+            )
+            .select_from(users.outerjoin(snapshot, snapshot.c.user_id == users.c.id))
+            .where(users.c.id.in_([row['user_id'] for row in rows]))
+        )
+    }
+    for row in rows:
+        standing = standings.get(row['user_id'])
+        row['name'] = standing.name if standing else None
+        row['rank'] = standing.rank if standing else None
+        row['points'] = standing.points if standing else None
+    return rows
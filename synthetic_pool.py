@@ -0,0 +1,93 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Synthetic Pools
+===========================================================
+Generate large fake pools over the seeded country catalog, used to verify
+scoring engines and to benchmark hot paths at realistic sizes.
+"""
+
+import random
+
+from sqlalchemy import insert, select
+
+from config import TIERS
+from models import db, User, Country, Pick, Tiebreaker
+
+SYNTHETIC_PREFIX = 'synthetic_'
+
+# Rows per executemany batch when bulk inserting
+BATCH_SIZE = 5000
+
+
+def populate_synthetic_pool(num_users: int, seed: int = 2026, randomize_medals: bool = True) -> int:
+    """
+    Insert num_users synthetic users, each with a valid 8-pick roster and a
+    tiebreaker, into the current session (nothing is committed).
+
+    Args:
+        num_users: Number of synthetic users to create
+        seed: Random seed so runs are reproducible
+        randomize_medals: Also assign random medal counts to every country
+
+    Returns:
+        Number of users created
+    """
+    rng = random.Random(seed)
+
+    countries = Country.query.filter_by(is_active=True).all()
+    by_tier = {tier: [] for tier in TIERS}
+    for country in countries:
+        by_tier.setdefault(country.tier, []).append(country.id)
+    for tier, config in TIERS.items():
+        if len(by_tier[tier]) < config['picks']:
+            raise RuntimeError(
+                f"Tier {tier} has {len(by_tier[tier])} active countries; "
+                f"run seed_data.py before building a synthetic pool."
+            )
+
+    if randomize_medals:
+        for country in countries:
+            country.gold_count = rng.randint(0, 12)
+            country.silver_count = rng.randint(0, 12)
+            country.bronze_count = rng.randint(0, 12)
+
+    # Continue numbering after any synthetic users already present
+    start = db.session.query(User).filter(User.username.like(f'{SYNTHETIC_PREFIX}%')).count()
+
+    for offset in range(0, num_users, BATCH_SIZE):
+        batch = range(start + offset, start + min(offset + BATCH_SIZE, num_users))
+        db.session.execute(insert(User.__table__), [
+            {
+                'username': f'{SYNTHETIC_PREFIX}{i}',
+                'email': f'{SYNTHETIC_PREFIX}{i}@example.com',
+                'password_hash': '!',  # Unusable: synthetic users cannot log in
+                'display_name': f'Synthetic Player {i}',
+                'total_points': 0,
+                'is_admin': False,
+            }
+            for i in batch
+        ])
+        user_ids = db.session.execute(
+            select(User.id).where(User.username.in_([f'{SYNTHETIC_PREFIX}{i}' for i in batch]))
+        ).scalars().all()
+
+        pick_rows = []
+        tiebreaker_rows = []
+        for user_id in user_ids:
+            for tier, config in TIERS.items():
+                for country_id in rng.sample(by_tier[tier], config['picks']):
+                    pick_rows.append({
+                        'user_id': user_id,
+                        'country_id': country_id,
+                        'tier': tier,
+                        'points_earned': 0,
+                    })
+            tiebreaker_rows.append({
+                'user_id': user_id,
+                'usa_gold': rng.randint(0, 15),
+                'usa_silver': rng.randint(0, 15),
+                'usa_bronze': rng.randint(0, 15),
+            })
+        db.session.execute(insert(Pick.__table__), pick_rows)
+        db.session.execute(insert(Tiebreaker.__table__), tiebreaker_rows)
+
+    return num_users
@@ -0,0 +1,104 @@
+"""
+2026 Milano-Cortina Winter Olympics Pool - Test Fixtures
+=========================================================
+Every test runs against a throwaway SQLite file built the way the benchmarks
+build theirs: migrated schema, the real country catalog and a scored
+synthetic pool. The app reads DATABASE_URL when it is imported, so the file
+is chosen here, before anything imports app or models.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from benchmarks.common import use_database, build_database, reset_database_file
+
+DB_DIR = tempfile.mkdtemp(prefix='olympics-pool-tests-')
+DB_PATH = os.path.join(DB_DIR, 'pool.db')
+use_database(DB_PATH)
+
+import catalog  # noqa: E402
+import models  # noqa: E402
+from app import app, fragment_cache  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+# What the database file currently holds, for build_pool(reuse=True)
+_built = {'key': None, 'pool': None}
+
+
+def build_pool(num_users: int = 20, simulation: bool = False, reuse: bool = False) -> dict:
+    """
+    Replace the database with a fresh pool of num_users plus one admin.
+
+    Args:
+        num_users: Synthetic players (each with a full roster and tiebreaker)
+        simulation: Also store a small simulation run (skipped without NumPy)
+        reuse: Keep the current database if it was built with the same
+               arguments by another reuse=True call; for read-only tests
+
+    Returns:
+        {'admin_id', 'player_id', 'country_id' (most picked), 'num_users'}
+    """
+    key = (num_users, simulation)
+    if reuse and _built['key'] == key:
+        return _built['pool']
+
+    with app.app_context():
+        models.db.session.remove()
+        models.db.engine.dispose()
+    reset_database_file(DB_PATH)
+    # Process caches are keyed by versions that restart with every database
+    models._game_state_cache.clear()
+    catalog._cache.clear()
+    fragment_cache.clear()
+
+    db_info = build_database(num_users)
+    with app.app_context():
+        player_id = models.db.session.scalar(
+            select(models.User.id).where(models.User.picks.any()).order_by(models.User.id).limit(1)
+        )
+        country_id = models.db.session.scalar(
+            select(models.Pick.country_id).group_by(models.Pick.country_id)
+            .order_by(func.count().desc(), models.Pick.country_id).limit(1)
+        )
+        if simulation:
+            from simulation import SimulationUnavailable, refresh_simulation
+            try:
+                refresh_simulation(50, workers=1)
+            except SimulationUnavailable:
+                pass
+        models.db.session.remove()
+
+    pool = {
+        'admin_id': db_info['admin_id'],
+        'player_id': player_id,
+        'country_id': country_id,
+        'num_users': num_users,
+    }
+    # Tests that did not ask for reuse may change the data
+    _built.update(key=key if reuse else None, pool=pool)
+    return pool
+
+
+@pytest.fixture
+def pool() -> dict:
+    """A fresh 20-player pool the test may modify."""
+    return build_pool()
+
+
+@pytest.fixture
+def app_context(pool):
+    """An app context on a fresh pool; the session is discarded afterwards."""
+    with app.app_context():
+        yield
+        models.db.session.remove()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _remove_database_dir():
+    yield
+    with app.app_context():
+        models.db.engine.dispose()
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,95 @@
+"""refresh_leaderboard_snapshot() keeps the snapshot equal to a full rebuild."""
+
+from sqlalchemy import delete, select, update
+
+from models import (
+    Country, LeaderboardSnapshot, Pick, User, _usa_actual, calculate_all_scores, db,
+    leaderboard_select, refresh_leaderboard_snapshot,
+)
+
+COLUMNS = ('points', 'rank', 'gold_diff', 'silver_diff', 'bronze_diff')
+
+
+def _rows(statement) -> dict:
+    return {row.user_id: tuple(getattr(row, column) for column in COLUMNS)
+            for row in db.session.execute(statement)}
+
+
+def _assert_matches_rebuild():
+    snapshot = _rows(select(LeaderboardSnapshot.__table__))
+    assert snapshot == _rows(leaderboard_select(_usa_actual()))
+
+
+def _versions() -> dict:
+    return dict(db.session.execute(select(LeaderboardSnapshot.user_id, LeaderboardSnapshot.version)).all())
+
+
+def _owned_by_few() -> Country:
+    """An active country exactly one player picked."""
+    country_id = db.session.scalar(
+        select(Pick.country_id).group_by(Pick.country_id).order_by(db.func.count(), Pick.country_id).limit(1)
+    )
+    others = select(Pick.id).where(Pick.country_id == country_id).offset(1)
+    db.session.execute(delete(Pick).where(Pick.id.in_(others)))
+    calculate_all_scores(commit_session=False)
+    refresh_leaderboard_snapshot(commit_session=False)
+    return db.session.get(Country, country_id)
+
+
+def test_small_change_rewrites_only_moved_rows(app_context):
+    country = _owned_by_few()
+    before = _versions()
+    country.bronze_count += 1
+    calculate_all_scores(commit_session=False)
+    refresh = refresh_leaderboard_snapshot(commit_session=False)
+
+    _assert_matches_rebuild()
+    after = _versions()
+    rewritten = {user_id for user_id in after if after[user_id] != before[user_id]}
+    assert 0 < len(rewritten) < len(after)
+    assert {user_id for user_id, _, _ in refresh.changed} <= rewritten
+
+
+def test_nothing_moved(app_context):
+    before = _versions()
+    refresh = refresh_leaderboard_snapshot(commit_session=False)
+    assert refresh.changed == []
+    assert _versions() == before
+
+
+def test_reshuffle_and_tiebreaker_changes(app_context):
+    # Most of the board moves: the table is rewritten in one statement
+    db.session.execute(update(Country).values(gold_count=Country.gold_count + Country.id % 3))
+    calculate_all_scores(commit_session=False)
+    refresh = refresh_leaderboard_snapshot(commit_session=False)
+    assert set(_versions().values()) == {refresh.version}
+    _assert_matches_rebuild()
+
+    # USA medals only move tiebreaker distances (and ranks within ties)
+    usa = db.session.execute(select(Country).where(Country.code == 'USA')).scalar_one()
+    usa.silver_count += 1
+    calculate_all_scores(commit_session=False)
+    refresh_leaderboard_snapshot(commit_session=False)
+    _assert_matches_rebuild()
+
+
+def test_players_joining_and_leaving(app_context):
+    leaver, template = db.session.execute(
+        select(User).where(User.picks.any()).order_by(User.id).limit(2)
+    ).scalars().all()
+    db.session.execute(delete(Pick).where(Pick.user_id == leaver.id))
+
+    joiner = User(username='joiner', email='joiner@example.com')
+    joiner.set_password('joiner')
+    db.session.add(joiner)
+    db.session.flush()
+    db.session.add_all(Pick(user_id=joiner.id, country_id=pick.country_id, tier=pick.tier)
+                       for pick in template.picks)
+    calculate_all_scores(commit_session=False)
+    refresh = refresh_leaderboard_snapshot(commit_session=False)
+
+    _assert_matches_rebuild()
+    snapshot = _versions()
+    assert leaver.id not in snapshot
+    assert snapshot[joiner.id] == refresh.version
+    assert joiner.id in {user_id for user_id, _, _ in refresh.changed}
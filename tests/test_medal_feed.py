@@ -0,0 +1,136 @@
+"""MedalFeedPoller against a local HTTP server serving fixture payloads."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select
+
+from medal_feed import APPLIED, ERROR, NO_CHANGES, NOT_MODIFIED, UNCHANGED, MedalFeedPoller
+from models import Country, MedalAudit, db
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Serves self.body with an ETag and answers 304 to a matching If-None-Match."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FeedHandler)
+        self.body = b'[]'
+        self.etag = None
+        self.requests = []  # Request headers, oldest first
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/medals.json'
+
+    def serve(self, rows, etag=None):
+        self.body = json.dumps(rows).encode()
+        self.etag = etag or f'"{hashlib.sha256(self.body).hexdigest()[:16]}"'
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed():
+    server = FeedServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _counts(code: str) -> dict:
+    country = db.session.execute(select(Country).where(Country.code == code)).scalar_one()
+    return {'code': code, 'gold': country.gold_count, 'silver': country.silver_count,
+            'bronze': country.bronze_count}
+
+
+def _feed_audits() -> list:
+    return db.session.execute(
+        select(MedalAudit).where(MedalAudit.source == 'feed').order_by(MedalAudit.id)
+    ).scalars().all()
+
+
+def test_applies_changed_counts_and_audits_them(app_context, feed):
+    before = _counts('NOR')
+    after = dict(before, gold=before['gold'] + 2)
+    feed.serve([after, _counts('USA')])
+    poller = MedalFeedPoller(feed.url)
+
+    assert poller.poll_once() == (APPLIED, ['NOR'])
+    assert _counts('NOR') == after
+    assert poller.etag == feed.etag
+
+    (audit,) = _feed_audits()
+    assert audit.country.code == 'NOR'
+    assert audit.updated_by_user_id is None
+    assert (audit.gold_before, audit.gold_after) == (before['gold'], after['gold'])
+    assert (audit.silver_before, audit.silver_after) == (before['silver'], after['silver'])
+
+
+def test_not_modified_and_unchanged_do_no_work(app_context, feed):
+    nor = _counts('NOR')
+    feed.serve([dict(nor, bronze=nor['bronze'] + 1)])
+    poller = MedalFeedPoller(feed.url)
+    assert poller.poll_once()[0] == APPLIED
+
+    # Same ETag: the server answers 304
+    assert poller.poll_once() == (NOT_MODIFIED, [])
+    assert feed.requests[-1]['If-None-Match'] == feed.etag
+
+    # New ETag, same bytes: skipped before touching the database
+    feed.etag = '"rotated"'
+    assert poller.poll_once() == (UNCHANGED, [])
+    assert poller.etag == '"rotated"'
+    assert len(_feed_audits()) == 1
+
+
+def test_bad_row_applies_nothing_and_keeps_no_validators(app_context, feed):
+    nor, usa = _counts('NOR'), _counts('USA')
+    feed.serve([dict(nor, gold=nor['gold'] + 1), dict(usa, silver=-1)])
+    poller = MedalFeedPoller(feed.url)
+
+    outcome, details = poller.poll_once()
+    assert outcome == ERROR
+    assert any('silver for USA must be zero or greater' in message for message in details)
+    assert (poller.etag, poller.last_modified, poller.last_digest) == (None, None, None)
+    assert _counts('NOR') == nor
+    assert _feed_audits() == []
+
+    # The rejected batch is fetched in full again, not answered with a 304
+    assert poller.poll_once()[0] == ERROR
+    assert 'If-None-Match' not in feed.requests[-1]
+
+
+def test_unknown_country_codes_are_ignored(app_context, feed):
+    nor = _counts('NOR')
+    feed.serve([{'code': 'XYZ', 'gold': 1, 'silver': 0, 'bronze': 0},
+                dict(nor, silver=nor['silver'] + 1)])
+    poller = MedalFeedPoller(feed.url)
+    assert poller.poll_once() == (APPLIED, ['NOR'])
+    assert [audit.country.code for audit in _feed_audits()] == ['NOR']
+
+    # A payload of only unknown codes changes nothing but is remembered
+    feed.serve([{'code': 'XYZ', 'gold': 2, 'silver': 0, 'bronze': 0}])
+    assert poller.poll_once() == (NO_CHANGES, [])
+    assert poller.etag == feed.etag
+    assert len(_feed_audits()) == 1
@@ -0,0 +1,63 @@
+"""Per-route SQL statement counts (query_budget.ROUTE_BUDGETS)."""
+
+import pytest
+
+from conftest import app, build_pool
+from models import SimulationRun, db
+from query_budget import ROUTE_BUDGETS, check_route_budgets, format_budget_results
+
+
+def _check(pool, budgets=None):
+    return check_route_budgets(
+        app,
+        viewers={'player': pool['player_id'], 'admin': pool['admin_id']},
+        params={'country_id': pool['country_id'], 'user_id': pool['player_id']},
+        budgets=budgets,
+    )
+
+
+@pytest.mark.parametrize('budget', ROUTE_BUDGETS,
+                         ids=lambda budget: f'{budget.viewer}:{budget.path}')
+def test_route_within_budget(budget):
+    pool = build_pool(simulation=True, reuse=True)
+    (result,) = _check(pool, [budget])
+    if result.skipped:
+        pytest.skip(format_budget_results([result])[0])
+    assert result.status_code == 200
+    if budget.known_issue is None:
+        assert result.queries <= budget.max_queries, format_budget_results([result])[0]
+
+
+def test_counts_do_not_depend_on_pool_size():
+    small = {(r.budget.viewer, r.budget.path): r.queries for r in _check(build_pool(5))}
+    large = {(r.budget.viewer, r.budget.path): r.queries for r in _check(build_pool(60))}
+    known_issues = {(b.viewer, b.path) for b in ROUTE_BUDGETS if b.known_issue}
+    scaling = [
+        f'{viewer} {path}: {small[viewer, path]} -> {large[viewer, path]}'
+        for viewer, path in small
+        if small[viewer, path] != large[viewer, path] and (viewer, path) not in known_issues
+    ]
+    assert not scaling
+
+
+def test_missing_simulation_is_skipped_not_failed(pool):
+    (budget,) = [b for b in ROUTE_BUDGETS if b.path == '/api/simulation']
+    (result,) = _check(pool, [budget])
+    assert result.status_code == 503
+    assert result.skipped and not result.failed
+
+
+def test_unexpected_status_is_an_error_not_an_overrun(pool):
+    (budget,) = [b for b in ROUTE_BUDGETS if b.path == '/user/{user_id}']
+    (result,) = _check(dict(pool, player_id=10 ** 9), [budget])
+    assert result.status_code == 404
+    assert result.error and not result.over_budget and result.failed
+
+
+def test_cli_passes_on_a_pool_without_simulation(pool):
+    with app.app_context():
+        assert db.session.query(SimulationRun).count() == 0
+    result = app.test_cli_runner().invoke(args=['check-query-budgets'])
+    assert result.exit_code == 0, result.output
+    assert 'All query budgets met.' in result.output
+    assert 'SKIP  anonymous /api/simulation             HTTP 503' in result.output
@@ -0,0 +1,42 @@
+"""EXPLAIN QUERY PLAN checks (query_plans.QUERY_PLAN_CHECKS) on a migrated database."""
+
+import pytest
+from sqlalchemy import select, text
+
+from conftest import app, build_pool
+from models import User, db
+from query_plans import QUERY_PLAN_CHECKS, check_query_plans, explain
+
+
+@pytest.fixture
+def migrated():
+    """A read-only pool migrated by upgrade_database(), with an app context."""
+    build_pool(reuse=True)
+    with app.app_context():
+        yield
+        db.session.remove()
+
+
+@pytest.mark.parametrize('check', QUERY_PLAN_CHECKS, ids=lambda check: check.label)
+def test_query_uses_its_index(migrated, check):
+    (result,) = check_query_plans([check])
+    assert result.passed, f'{result.sql}\n' + '\n'.join(result.plan)
+
+
+def test_dropped_index_is_caught(app_context):
+    db.session.execute(text('DROP INDEX ix_countries_points'))
+    (check,) = [check for check in QUERY_PLAN_CHECKS if check.index == 'ix_countries_points']
+    (result,) = check_query_plans([check])
+    assert not result.passed
+
+
+def test_explain_expands_in_lists(migrated):
+    sql, plan = explain(select(User.id).where(User.id.in_([1, 2, 3])))
+    assert 'IN (?, ?, ?)' in sql
+    assert plan
+
+
+def test_cli_passes(migrated):
+    result = app.test_cli_runner().invoke(args=['check-query-plans'])
+    assert result.exit_code == 0, result.output
+    assert 'All query plans use their indexes.' in result.output
@@ -0,0 +1,64 @@
+"""The scoring engines (models.SCORING_ENGINES) agree on every total and pick."""
+
+import pytest
+from sqlalchemy import select, update
+
+from models import Country, Pick, SCORING_ENGINES, User, calculate_all_scores, db
+
+
+def _score(engine: str) -> tuple[dict, dict]:
+    """Run an engine over cleared scores; return ({user_id: total}, {pick_id: points})."""
+    db.session.execute(update(User).values(total_points=-1))
+    db.session.execute(update(Pick).values(points_earned=-1))
+    calculate_all_scores(commit_session=False, engine=engine)
+    db.session.flush()
+    totals = dict(db.session.execute(select(User.id, User.total_points)).all())
+    points = dict(db.session.execute(select(Pick.id, Pick.points_earned)).all())
+    return totals, points
+
+
+@pytest.fixture
+def tied_pool(app_context):
+    """
+    The 20-player pool plus two rosters copied from the first player (a
+    three-way tie) and one player whose countries have all won nothing.
+    """
+    users = db.session.execute(select(User).where(User.picks.any()).order_by(User.id)).scalars().all()
+    template, blank = users[0], users[1]
+    for name in ('tie_a', 'tie_b'):
+        clone = User(username=name, email=f'{name}@example.com')
+        clone.set_password(name)
+        db.session.add(clone)
+        db.session.flush()
+        db.session.add_all(Pick(user_id=clone.id, country_id=pick.country_id, tier=pick.tier)
+                           for pick in template.picks)
+
+    blank_ids = [pick.country_id for pick in blank.picks]
+    db.session.execute(update(Country).where(Country.id.in_(blank_ids))
+                       .values(gold_count=0, silver_count=0, bronze_count=0))
+    db.session.flush()
+    return template.id, blank.id
+
+
+@pytest.mark.parametrize('engine', sorted(set(SCORING_ENGINES) - {'orm'}))
+def test_engine_matches_orm(tied_pool, engine):
+    if engine == 'matrix':
+        pytest.importorskip('numpy')
+    template_id, blank_id = tied_pool
+
+    expected_totals, expected_points = _score('orm')
+    actual_totals, actual_points = _score(engine)
+    assert actual_totals == expected_totals
+    assert actual_points == expected_points
+
+    # The pool really has the cases under test
+    assert list(expected_totals.values()).count(expected_totals[template_id]) >= 3
+    assert expected_totals[blank_id] == 0
+
+
+def test_orm_matches_country_points(tied_pool):
+    _, points = _score('orm')
+    country_points = dict(db.session.execute(
+        select(Pick.id, Country.points).join(Country, Country.id == Pick.country_id)
+    ).all())
+    assert points == country_points